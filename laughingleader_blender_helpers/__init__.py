@@ -117,6 +117,110 @@ class LeaderHelpersAddonPreferences(AddonPreferences):
         min=1
     )
 
+    from . import uv_helpers_arrays
+
+    uvhelpers_errorchecker_triangulation = EnumProperty(
+        name="Triangulation",
+        description="How quads and n-gons are split into triangles before checking, to match the exporter",
+        items=uv_helpers_arrays.triangulation_methods,
+        default=("FAN")
+    )
+
+    uvhelpers_errorchecker_all_selected = BoolProperty(
+            name="Check All Selected",
+            description="Check every selected mesh instead of only the active object",
+            default=False
+    )
+
+    uvhelpers_errorchecker_incremental = BoolProperty(
+            name="Incremental Check",
+            description="Only recheck faces whose UVs changed since the last check. A full check runs when the mesh topology changes",
+            default=True
+    )
+
+    uvhelpers_errorchecker_print_errors = BoolProperty(
+            name="Print to Console",
+            description="Print a short summary of the problems found to the console",
+            default=False
+    )
+
+    uvhelpers_errorchecker_tangent_angle = FloatProperty(
+            name="Min Tangent Angle",
+            description="Tangent frames where the tangent and bitangent are closer to parallel than this angle (in degrees) are reported",
+            default=5.0,
+            min=0.0,
+            max=90.0
+    )
+
+    uvhelpers_errorchecker_sanity = BoolProperty(
+            name="Check UV Sanity",
+            description="Also look for NaN/infinite UVs, UVs far outside the 0-1 range and flipped faces when checking UV triangles",
+            default=True
+    )
+
+    uvhelpers_errorchecker_uv_range = FloatProperty(
+            name="Max UV Distance",
+            description="How far UVs can go outside the 0-1 range before they're reported as out of range",
+            default=1.0,
+            min=0.0
+    )
+
+    uvhelpers_errorchecker_all_layers = BoolProperty(
+            name="All UV Maps",
+            description="Run the UV sanity check on every UV map instead of only the active one",
+            default=False
+    )
+
+    uvhelpers_errorchecker_texel_resolution = IntProperty(
+        name="Texture Size",
+        description="The texture resolution used to measure texel density (in pixels)",
+        default=1024,
+        min=1
+    )
+
+    uvhelpers_errorchecker_texel_density = FloatProperty(
+            name="Target Density",
+            description="The texel density faces should have (pixels per unit). 0 uses the average density of the checked meshes",
+            default=0.0,
+            min=0.0
+    )
+
+    uvhelpers_errorchecker_texel_tolerance = FloatProperty(
+            name="Tolerance",
+            description="How far (in percent) a face's texel density can be from the target before it's reported",
+            default=10.0,
+            min=0.0,
+            max=100.0
+    )
+
+    uvhelpers_errorchecker_texel_islands = BoolProperty(
+            name="Per Island",
+            description="Compare the texel density of whole UV islands instead of single faces",
+            default=True
+    )
+
+    uvhelpers_images_watch_interval = FloatProperty(
+            name="Poll Interval",
+            description="How often (in seconds) the texture watcher checks image files for changes",
+            default=1.0,
+            min=0.1
+    )
+
+    uvhelpers_images_watch_debounce = FloatProperty(
+            name="Debounce",
+            description="How long (in seconds) a changed file must stay unchanged before it's reloaded, so files that are still being saved aren't reloaded",
+            default=0.5,
+            min=0.0
+    )
+
+    uvhelpers_images_watch_workers = IntProperty(
+        name="Threads",
+        description="How many threads the texture watcher uses to check files. More threads help with network drives, fewer use less CPU",
+        default=4,
+        min=1,
+        max=64
+    )
+
     from . import layer_manager
 
     layer_manager_enabled = BoolProperty(default=True, name="Enable", description="Enable the Layer Manager", update=layer_manager.enabled_changed)
@@ -153,6 +257,8 @@ class LeaderHelpersAddonPreferences(AddonPreferences):
         layout.prop(self, "debug_mode")
         return
 
+from . import image_helpers_template
+
 import posixpath
 import os.path
 
@@ -189,61 +295,68 @@ class LeaderHelpers_GeneralSettings(PropertyGroup):
         default=".png"
     )
 
-    def images_quickexport_update_filepath(self, context):
-        fp = self.uvhelpers_images_quickexport_filepath
-        fp_last = self.uvhelpers_images_quickexport_last_filepath
+    def images_quickexport_get_directory(self):
         fp_dir = self.uvhelpers_images_quickexport_directory
+        if fp_dir == "":
+            return os.path.dirname(bpy.data.filepath)
+        if os.path.isabs(fp_dir):
+            return fp_dir
+        base_dir = bpy.path.abspath(os.path.dirname(bpy.data.filepath))
+        return os.path.abspath(os.path.join(base_dir, fp_dir))
+
+    def images_quickexport_get_name(self, context):
+        '''The Manual Name, or the Auto-Name (first visible named layer or the active object),
+        falling back to the blend file name.'''
+        if self.uvhelpers_images_quickexport_manualname != "":
+            return self.uvhelpers_images_quickexport_manualname
         fp_auto = self.uvhelpers_images_quickexport_autoname
-        fp_manual = self.uvhelpers_images_quickexport_manualname
-        fp_append = self.uvhelpers_images_quickexport_append
-        ext = self.uvhelpers_images_quickexport_filename_ext
-        fp_result = ""
-        if fp != "" and fp_last == "":
-            self.uvhelpers_images_quickexport_last_filepath = fp
+        scene = context.scene
+        if fp_auto == "LAYER" and hasattr(scene, "namedlayers"):
+            for visible, layer in zip(scene.layers, scene.namedlayers.layers):
+                if visible and layer.name:
+                    return layer.name
+        elif fp_auto == "OBJECT":
+            obj = scene.objects.active
+            return obj.name if obj is not None else "object"
+        return self.images_quickexport_get_blend_name() or "image"
+
+    def images_quickexport_get_blend_name(self):
+        return os.path.splitext(bpy.path.basename(bpy.data.filepath))[0]
+
+    def images_quickexport_get_template(self):
+        return image_helpers_template.get_template(self.uvhelpers_images_quickexport_template or image_helpers_template.default_template)
+
+    def images_quickexport_get_values(self, context, date="", name=None):
+        '''Template field values. Batch exports pass each image name in as the name.'''
+        return {
+            "dir": self.images_quickexport_get_directory(),
+            "name": self.images_quickexport_get_name(context) if name is None else name,
+            "blend": self.images_quickexport_get_blend_name(),
+            "append": self.uvhelpers_images_quickexport_append,
+            "date": date,
+            "ext": self.uvhelpers_images_quickexport_filename_ext,
+        }
+
+    def images_quickexport_resolve(self, context, date="", name=None):
+        return self.images_quickexport_get_template().resolve(self.images_quickexport_get_values(context, date, name))
 
-        if fp_dir == "":
-            fp_dir = os.path.dirname(bpy.data.filepath)
-        else:
-            if os.path.isabs(fp_dir):
-                fp_dir = self.uvhelpers_images_quickexport_directory
-            else:
-                base_dir = bpy.path.abspath(os.path.dirname(bpy.data.filepath))
-                fp_dir = os.path.abspath(os.path.join(base_dir, self.uvhelpers_images_quickexport_directory))
-
-        if fp == "":
-            fp = "{}\\{}".format(fp_dir, str.replace(bpy.path.basename(bpy.data.filepath), ".blend", ""))
-
-        if fp != "":
-            if fp_manual != "":
-                fp = "{}\\{}".format(fp_dir, fp_manual)
-            else:
-                if fp_auto == "LAYER":
-                    if hasattr(context.scene, "namedlayers"):
-                        for i in range(20):
-                            if (context.scene.layers[i]):
-                                    layername = context.scene.namedlayers.layers[i].name
-                                    if layername is not None and layername != "":
-                                        fp = "{}\\{}".format(fp_dir, layername)
-                                        break
-                elif fp_auto == "OBJECT":
-                    obj_name = "object"
-                    if getattr(context.scene.objects, "active", None) is not None and hasattr(context.scene.objects.active, "name"):
-                        obj_name = context.scene.objects.active.name
-                    fp = "{}\\{}".format(fp_dir, obj_name)
-                    print("Obj name: {}".format(obj_name))
-                elif fp_auto == "DISABLED" and fp_last != "":
-                    fp = "{}\\{}".format(fp_dir, str.replace(bpy.path.basename(bpy.data.filepath), ".blend", ""))
-        if fp_append != "":
-            fp = "{}_{}".format(fp, fp_append)
-
-        fp_result = bpy.path.ensure_ext(fp, ext)
-        print("Path: Dir {} | Path: {}".format(fp_dir, fp_result))
-
-        #self.uvhelpers_images_quickexport_directory = fp_dir
-        self.uvhelpers_images_quickexport_filepath = fp_result
-        self.uvhelpers_images_quickexport_last_filepath = fp_result
+    def images_quickexport_update_filepath(self, context):
+        fp_result = self.images_quickexport_resolve(context)
+        # Only write when the path changed, writing redraws every panel showing it
+        if self.uvhelpers_images_quickexport_filepath != fp_result:
+            self.uvhelpers_images_quickexport_filepath = fp_result
+            self.uvhelpers_images_quickexport_last_filepath = fp_result
         return
-    
+
+    uvhelpers_images_quickexport_template = StringProperty(
+        name="File Name",
+        description=("Template for export file paths. Fields: {dir} (target directory), {name} (manual or auto-name, the image name for Export All Images), "
+            "{blend} (blend file name), {append} (append text), {date} (only when Append Date is enabled) and {ext}.\n"
+            "A separator before an empty field is removed"),
+        default=image_helpers_template.default_template,
+        update=images_quickexport_update_filepath
+    )
+
     uvhelpers_images_quickexport_directory = StringProperty(
         name="Target Directory",
         default="",
@@ -257,6 +370,23 @@ class LeaderHelpers_GeneralSettings(PropertyGroup):
         default=False
     )
 
+    uvhelpers_images_batchexport_filter = EnumProperty(
+        name="Images",
+        description="Which images Export All Images writes",
+        items=(("ALL", "All", "Every image with pixel data"),
+               ("DIRTY", "Modified", "Images with unsaved changes"),
+               ("GENERATED", "Generated", "Generated images, like bakes"),
+               ("VISIBLE", "Visible Objects", "Images used by the materials of visible objects"),
+               ("PATTERN", "Name Pattern", "Images whose name matches the pattern")),
+        default=("ALL")
+    )
+
+    uvhelpers_images_batchexport_pattern = StringProperty(
+        name="Pattern",
+        description="Image name pattern, with * and ? wildcards (e.g. *_Normal)",
+        default="*"
+    )
+
     uvhelpers_images_quickexport_autoname = EnumProperty(
         name="Auto-Name",
         description="Auto-generate a filename based on a property name",
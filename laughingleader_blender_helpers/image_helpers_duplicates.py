@@ -0,0 +1,101 @@
+import hashlib
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from . import image_helpers_index
+
+# Duplicate image detection.
+# Images are grouped by a hash of their content: the file for file images, the packed data for
+# packed images and the generation settings for generated ones. Images with unsaved changes are
+# skipped, reading their pixels in 2.79 means one Python float per channel. File hashes are
+# cached by path, size and mtime, so running the check again only hashes files that changed.
+
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = 8
+
+hash_cache = {}
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+def generated_image_key(generated_type, width, height, color, use_float):
+    '''Bytes describing an unmodified generated image, which its settings fully determine.'''
+    return repr((generated_type, width, height, tuple(round(value, 6) for value in color), use_float)).encode("utf-8")
+
+def hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cached_file_hash(path):
+    '''Hash of a file, reusing the last hash while its size and mtime are the same.'''
+    stat = image_helpers_index.stat_file(path)
+    if stat is None:
+        return None
+    cached = hash_cache.get(path)
+    if cached is not None and cached[0] == stat:
+        return cached[1]
+    try:
+        digest = hash_file(path)
+    except OSError:
+        return None
+    hash_cache[path] = (stat, digest)
+    return digest
+
+def hash_sources(sources, max_workers=None):
+    '''Hash (name, kind, value) sources in a thread pool, where kind is "FILE" (value is a path)
+    or "DATA" (value is bytes). Returns a dict of name -> hash (None if it couldn't be read).'''
+    def run(source):
+        name, kind, value = source
+        return name, cached_file_hash(value) if kind == "FILE" else hash_bytes(value)
+    if len(sources) == 0:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers or HASH_WORKERS, len(sources))) as executor:
+        return dict(executor.map(run, sources))
+
+_numbered_name = re.compile(r"\.\d{3,}$")
+
+def canonical_order(name):
+    '''Sort key preferring names without a ".001" style suffix, then shorter names.'''
+    return (_numbered_name.search(name) is not None, len(name), name)
+
+class LLUVHelpers_DuplicateGroup:
+    '''Images with identical content. The first name is the one the others get remapped to.
+    image_bytes is the estimated memory of each image, unloaded images use none.'''
+    def __init__(self, names, image_bytes):
+        self.names = sorted(names, key=canonical_order)
+        self.image_bytes = image_bytes
+
+    @property
+    def canonical(self):
+        return self.names[0]
+
+    @property
+    def duplicates(self):
+        return self.names[1:]
+
+    @property
+    def reclaimable_bytes(self):
+        '''Memory freed by removing the duplicates, the canonical image stays loaded.'''
+        return sum(self.image_bytes.get(name, 0) for name in self.duplicates)
+
+def group_duplicates(hashes, keys, image_bytes):
+    '''Duplicate groups from name -> hash, name -> extra grouping key (e.g. color space) and
+    name -> estimated memory, largest reclaimable memory first.'''
+    groups = OrderedDict()
+    for name, digest in hashes.items():
+        if digest is not None:
+            groups.setdefault((digest, keys.get(name)), []).append(name)
+    result = [LLUVHelpers_DuplicateGroup(names, dict((name, image_bytes.get(name, 0)) for name in names)) for names in groups.values() if len(names) > 1]
+    result.sort(key=lambda group: group.reclaimable_bytes, reverse=True)
+    return result
+
+def format_bytes(total):
+    for unit in ("B", "KB", "MB"):
+        if total < 1024:
+            return "{:.1f} {}".format(total, unit) if unit != "B" else "{} B".format(total)
+        total /= 1024.0
+    return "{:.2f} GB".format(total)
@@ -0,0 +1,25 @@
+import fnmatch
+import os
+
+# Batch image export helpers.
+# Picks which images an export covers and the file names they're written to. The images
+# themselves are saved with save_render, the only fast way to get at pixels in 2.79.
+
+image_extensions = (".png", ".jpg", ".jpeg", ".tga", ".bmp", ".tif", ".tiff", ".exr", ".hdr", ".dds", ".psd")
+
+def image_base_name(image_name):
+    '''The image name without a file extension already in it (e.g. "Skin.png" -> "Skin").'''
+    name, ext = os.path.splitext(image_name)
+    if ext.lower() not in image_extensions:
+        return image_name
+    return name
+
+def match_images(images, mode="ALL", pattern="*"):
+    '''Filter (name, is_dirty, is_generated) tuples by the batch export mode, returning names.'''
+    if mode == "DIRTY":
+        return [name for name, dirty, generated in images if dirty]
+    if mode == "GENERATED":
+        return [name for name, dirty, generated in images if generated]
+    if mode == "PATTERN":
+        return [name for name, dirty, generated in images if fnmatch.fnmatchcase(name, pattern)]
+    return [name for name, dirty, generated in images]
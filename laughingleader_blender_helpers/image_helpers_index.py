@@ -0,0 +1,140 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Image file index.
+# Remembers the size and modification time of every image file when it was last (re)loaded,
+# so only images whose files changed on disk need to be reloaded. Files are stat'ed from a
+# thread pool, which hides most of the latency of network shares.
+
+STAT_WORKERS = 16
+
+def stat_file(path):
+    '''(size, mtime in nanoseconds) of a file, or None if it doesn't exist.'''
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    return (result.st_size, result.st_mtime_ns)
+
+def stat_files(paths, max_workers=None):
+    '''stat_file for every path, as a dict of path -> stat, using a thread pool.'''
+    paths = list(set(paths))
+    if len(paths) <= 1:
+        return dict((path, stat_file(path)) for path in paths)
+    workers = min(max_workers or STAT_WORKERS, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(stat_file, paths)))
+
+class LLUVHelpers_ImageFileIndex:
+    '''image name -> (path, stat) of every image file, as of its last reload.'''
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+
+    def update(self, name, path, stat):
+        self.entries[name] = (path, stat)
+
+    def is_changed(self, name, path, stat):
+        '''Images that aren't indexed yet count as changed.'''
+        return self.entries.get(name) != (path, stat)
+
+    def compare(self, images, stats):
+        '''Split (name, path) pairs into (changed, missing, unchanged) lists, given stat_files results.'''
+        changed = []
+        missing = []
+        unchanged = []
+        for name, path in images:
+            stat = stats.get(path)
+            if stat is None:
+                missing.append((name, path))
+            elif self.is_changed(name, path, stat):
+                changed.append((name, path))
+            else:
+                unchanged.append((name, path))
+        return changed, missing, unchanged
+
+class LLUVHelpers_ImageWatcher:
+    '''Polls an image index for changed files from a background thread.
+
+    start_poll stats the files on a worker thread, collect (called from the main thread) returns
+    the images whose files changed and then stayed the same for at least debounce seconds, so
+    files that are still being written aren't reloaded half way.
+    Images that were never reloaded aren't in the index, so their state when the watcher first
+    saw them is kept in seen instead. The index only changes when an image is really reloaded.
+    '''
+    def __init__(self, index, debounce=0.5, max_workers=4):
+        self.index = index
+        self.debounce = debounce
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+        self.pending = {}
+        self.seen = {}
+        self.total_images = 0
+        self.total_polls = 0
+        self.total_reloads = 0
+        self.last_poll_time = 0.0
+
+    @property
+    def busy(self):
+        return self.future is not None
+
+    def start_poll(self, images):
+        '''Stat the (name, path) images in the background. Returns False if a poll is still running.'''
+        if self.future is not None:
+            return False
+        self.total_images = len(images)
+        self.future = self.executor.submit(self._poll, images, self.max_workers)
+        return True
+
+    @staticmethod
+    def _poll(images, max_workers):
+        start = time.perf_counter()
+        stats = stat_files([path for name, path in images], max_workers)
+        return images, stats, time.perf_counter() - start
+
+    def collect(self, now):
+        '''(name, path, stat) of the images ready to reload, once the running poll finished.'''
+        if self.future is None or not self.future.done():
+            return []
+        images, stats, elapsed = self.future.result()
+        self.future = None
+        self.total_polls += 1
+        self.last_poll_time = elapsed
+
+        ready = []
+        for name, path in images:
+            stat = stats.get(path)
+            if stat is None:
+                self.pending.pop(name, None)
+                continue
+            if name in self.index.entries:
+                changed = self.index.is_changed(name, path, stat)
+            elif name in self.seen:
+                changed = self.seen[name] != (path, stat)
+            else:
+                # First time this image is seen, remember it without reloading
+                self.seen[name] = (path, stat)
+                continue
+            if not changed:
+                self.pending.pop(name, None)
+            else:
+                pending = self.pending.get(name)
+                if pending is None or pending[1] != stat:
+                    self.pending[name] = (path, stat, now)
+                elif now - pending[2] >= self.debounce:
+                    del self.pending[name]
+                    self.seen[name] = (path, stat)
+                    ready.append((name, path, stat))
+        return ready
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+image_index = LLUVHelpers_ImageFileIndex()
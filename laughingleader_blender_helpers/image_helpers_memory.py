@@ -0,0 +1,71 @@
+# Image memory report.
+# Lists the loaded image buffers and how much memory each one takes, so the biggest images and
+# the ones nothing visible uses can be found (and their buffers freed) quickly.
+
+from . import image_helpers_duplicates
+
+def buffer_bytes(width, height, channels, is_float):
+    '''Size of an image buffer. Byte buffers always store RGBA, float buffers store their channels.'''
+    return width * height * (channels * 4 if is_float else 4)
+
+class LLUVHelpers_ImageMemoryEntry:
+    def __init__(self, name, loaded, width=0, height=0, channels=0, is_float=False, packed_size=0, users=0, visible=False, dirty=False):
+        self.name = name
+        self.loaded = loaded
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.is_float = is_float
+        self.packed_size = packed_size
+        self.users = users
+        self.visible = visible
+        self.dirty = dirty
+
+    @property
+    def memory(self):
+        '''Estimated size of the pixel buffer, plus the packed file kept in memory.'''
+        buffer_size = buffer_bytes(self.width, self.height, self.channels, self.is_float) if self.loaded else 0
+        return buffer_size + self.packed_size
+
+    @property
+    def can_free(self):
+        '''Loaded, not used by anything visible, and without unsaved changes that freeing would lose.'''
+        return self.loaded and not self.visible and not self.dirty
+
+    def describe(self):
+        if not self.loaded:
+            return "not loaded"
+        return "{}x{} {}ch {}".format(self.width, self.height, self.channels, "float" if self.is_float else "byte")
+
+class LLUVHelpers_ImageMemoryReport:
+    '''Image memory entries, largest first.'''
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: entry.memory, reverse=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def total(self):
+        return sum(entry.memory for entry in self.entries)
+
+    @property
+    def freeable(self):
+        return [entry for entry in self.entries if entry.can_free]
+
+    @property
+    def freeable_memory(self):
+        return sum(entry.memory - entry.packed_size for entry in self.freeable)
+
+    def summary(self):
+        return "{} in {} images ({} freeable)".format(image_helpers_duplicates.format_bytes(self.total), len(self),
+            image_helpers_duplicates.format_bytes(self.freeable_memory))
+
+memory_report = None
+
+def set_report(report):
+    global memory_report
+    memory_report = report
+
+def get_report():
+    return memory_report
@@ -0,0 +1,47 @@
+import numpy as np
+import struct
+import zlib
+
+# Minimal PNG encoding for RGBA pixel arrays.
+# Only needs NumPy and zlib, so it runs outside Blender's image API (and off the main thread).
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+PROGRESS_ROWS = 256
+
+def encode_png(pixels, compression=6, progress=None):
+    '''PNG file bytes for an (height, width, 4) uint8 RGBA array, stored top row first.
+
+    progress is an optional function called with the fraction of rows compressed so far.
+    '''
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    height, width, channels = pixels.shape
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+    # Every scanline starts with its filter type (0, none)
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+
+    compressor = zlib.compressobj(compression)
+    data = []
+    for start in range(0, height, PROGRESS_ROWS):
+        data.append(compressor.compress(raw[start:start + PROGRESS_ROWS].tobytes()))
+        if progress is not None:
+            progress(min(start + PROGRESS_ROWS, height) / height)
+    data.append(compressor.flush())
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join((
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", header),
+        _chunk(b"IDAT", b"".join(data)),
+        _chunk(b"IEND", b""),
+    ))
+
+def write_png(filepath, pixels, compression=6, progress=None):
+    data = encode_png(pixels, compression, progress)
+    with open(filepath, "wb") as f:
+        f.write(data)
+    return filepath
@@ -0,0 +1,132 @@
+import numpy as np
+
+from . import uv_helpers_arrays
+
+# CPU UV layout rasterizer.
+# Triangles are filled with a vectorized scanline pass (one span per triangle and pixel row)
+# and edges are drawn as sampled lines, straight into an RGBA NumPy image.
+
+PIXEL_CHUNK_SIZE = 4000000
+
+def new_image(width, height, color=(0, 0, 0, 0)):
+    image = np.empty((height, width, 4), dtype=np.uint8)
+    image[:] = color
+    return image
+
+def to_color(color):
+    '''A float RGBA color (0-1) as uint8.'''
+    return np.clip(np.round(np.asarray(color, dtype=np.float64) * 255.0), 0, 255).astype(np.uint8)
+
+def _expand_spans(starts, counts):
+    '''Every index covered by spans of (start, count), in chunks of about PIXEL_CHUNK_SIZE.'''
+    ends = np.cumsum(counts)
+    first = 0
+    while first < len(counts):
+        last = int(np.searchsorted(ends, (ends[first - 1] if first > 0 else 0) + PIXEL_CHUNK_SIZE, side="right"))
+        last = max(last, first + 1)
+        span_counts = counts[first:last]
+        offsets = np.cumsum(span_counts) - span_counts
+        local = np.arange(int(span_counts.sum()), dtype=np.int64) - np.repeat(offsets, span_counts)
+        yield first, last, np.repeat(starts[first:last], span_counts) + local, span_counts
+        first = last
+
+def fill_triangles(image, points, colors):
+    '''Fill (n, 3, 2) triangles, given in pixel coordinates, with (n, 4) or (4,) uint8 colors.
+
+    Pixels are filled when their center is inside a triangle (half-open on the right and top
+    edges, so neighbouring triangles don't overlap). Later triangles draw over earlier ones.
+    '''
+    height, width = image.shape[:2]
+    flat = image.reshape(-1, 4)
+    if len(points) == 0:
+        return image
+    points = points.astype(np.float64)
+    ys = points[:, :, 1]
+
+    row_min = np.maximum(np.ceil(ys.min(axis=1) - 0.5), 0).astype(np.int64)
+    row_max = np.minimum(np.ceil(ys.max(axis=1) - 0.5) - 1, height - 1).astype(np.int64)
+    row_counts = np.maximum(row_max - row_min + 1, 0)
+
+    tris = np.repeat(np.arange(len(points), dtype=np.int64), row_counts)
+    offsets = np.cumsum(row_counts) - row_counts
+    rows = row_min[tris] + (np.arange(len(tris), dtype=np.int64) - np.repeat(offsets, row_counts))
+    center = rows + 0.5
+
+    # Where the row center crosses each edge, the span runs between the outermost crossings
+    left = np.full(len(tris), np.inf)
+    right = np.full(len(tris), -np.inf)
+    for i in range(3):
+        p0 = points[tris, i]
+        p1 = points[tris, (i + 1) % 3]
+        low = np.minimum(p0[:, 1], p1[:, 1])
+        high = np.maximum(p0[:, 1], p1[:, 1])
+        crosses = (center >= low) & (center < high)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = p0[:, 0] + (center - p0[:, 1]) * (p1[:, 0] - p0[:, 0]) / (p1[:, 1] - p0[:, 1])
+        left = np.where(crosses, np.minimum(left, x), left)
+        right = np.where(crosses, np.maximum(right, x), right)
+
+    valid = np.isfinite(left) & np.isfinite(right)
+    col_start = np.zeros(len(tris), dtype=np.int64)
+    col_end = np.full(len(tris), -1, dtype=np.int64)
+    col_start[valid] = np.maximum(np.ceil(left[valid] - 0.5), 0)
+    col_end[valid] = np.minimum(np.ceil(right[valid] - 0.5) - 1, width - 1)
+    counts = np.maximum(col_end - col_start + 1, 0)
+
+    keep = counts > 0
+    tris = tris[keep]
+    starts = rows[keep] * width + col_start[keep]
+    counts = counts[keep]
+    colors = np.asarray(colors, dtype=np.uint8)
+    for first, last, pixels, span_counts in _expand_spans(starts, counts):
+        if colors.ndim == 1:
+            flat[pixels] = colors
+        else:
+            flat[pixels] = np.repeat(colors[tris[first:last]], span_counts, axis=0)
+    return image
+
+def draw_lines(image, starts, ends, color):
+    '''Draw (n, 2) -> (n, 2) line segments, in pixel coordinates, with a (4,) uint8 color.'''
+    height, width = image.shape[:2]
+    flat = image.reshape(-1, 4)
+    if len(starts) == 0:
+        return image
+    starts = starts.astype(np.float64) - 0.5
+    delta = ends.astype(np.float64) - 0.5 - starts
+    steps = np.ceil(np.max(np.abs(delta), axis=1))
+    # Skip absurdly long segments (NaN/huge UVs), they'd mostly sample outside the image
+    with np.errstate(invalid="ignore"):
+        inside = np.isfinite(steps) & (steps <= 4 * max(width, height))
+    starts = starts[inside]
+    delta = delta[inside]
+    counts = steps[inside].astype(np.int64) + 1
+
+    for first, last, samples, sample_counts in _expand_spans(np.zeros(len(counts), dtype=np.int64), counts):
+        segments = np.repeat(np.arange(first, last), sample_counts)
+        t = samples / np.maximum(counts[segments] - 1, 1)
+        x = np.round(starts[segments, 0] + delta[segments, 0] * t).astype(np.int64)
+        y = np.round(starts[segments, 1] + delta[segments, 1] * t).astype(np.int64)
+        on_image = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        flat[y[on_image] * width + x[on_image]] = color
+    return image
+
+def render_uv_layout(arrays, width, height, fill_color, wire_color, error_color=None, error_points=None, method="FAN"):
+    '''An (height, width, 4) uint8 image of the UV layout, top row first (ready for PNG).
+
+    error_points is an optional (n, 3, 2) array of UV triangles drawn with error_color on top.
+    '''
+    image = new_image(width, height)
+    scale = np.array((width, height), dtype=np.float64)
+    if arrays.uvs is None or arrays.total_polys == 0:
+        return image
+    uvs = arrays.uvs.astype(np.float64) * scale
+
+    if fill_color[3] > 0:
+        tris, tri_polys = uv_helpers_arrays.triangulate(arrays, method)
+        fill_triangles(image, uvs[tris], to_color(fill_color))
+    if error_points is not None and len(error_points) > 0 and error_color is not None:
+        fill_triangles(image, error_points.astype(np.float64) * scale, to_color(error_color))
+    if wire_color[3] > 0:
+        draw_lines(image, uvs, uvs[arrays.next_loops], to_color(wire_color))
+    # UV space has v going up, images are stored top row first
+    return image[::-1]
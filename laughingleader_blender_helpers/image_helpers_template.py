@@ -0,0 +1,120 @@
+import os
+import re
+from datetime import datetime
+
+# Export file path templates.
+# A template like "{dir}/{name}_{append}_{date}{ext}" is parsed once into literal text and fields.
+# Resolving it only joins strings, and the last result is kept until one of the inputs changes.
+
+template_fields = ("dir", "name", "blend", "append", "date", "ext")
+default_template = "{dir}/{name}_{append}_{date}{ext}"
+date_format = "%m-%d-%Y_%H-%M-%S"
+
+_field_pattern = re.compile(r"\{(\w+)\}")
+_separator_pattern = re.compile(r"[/\\]+")
+_invalid_chars = '<>:"/\\|?*'
+_separators = "_- "
+
+def format_date(timestamp=None):
+    date = datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)
+    return date.strftime(date_format)
+
+def clean_name(name):
+    '''A field value that is safe to use as (part of) a file name.'''
+    for char in _invalid_chars:
+        name = name.replace(char, "_")
+    return name
+
+def os_path(path):
+    '''Convert / and \\ separators to the OS separator, collapsing repeated ones.
+    Leading separators are kept as they are, for absolute and UNC paths.'''
+    stripped = path.lstrip("/\\")
+    lead = os.sep * (len(path) - len(stripped))
+    return lead + _separator_pattern.sub(lambda match: os.sep, stripped)
+
+class LLUVHelpers_FilepathTemplate:
+    '''A parsed file path template.
+
+    parts is a list of (literal, field) pairs, with the literal text already using OS separators.
+    Unknown fields are kept as literal text. When a field resolves to an empty string, one
+    separator (_, - or a space) right before it is dropped too, so "{name}_{append}" gives
+    "name" when there's nothing to append. Without an {ext} field, the extension goes at the end.
+    '''
+    def __init__(self, template):
+        self.template = template
+        self.parts = []
+        literal = ""
+        last = 0
+        for match in _field_pattern.finditer(template):
+            literal += template[last:match.start()]
+            last = match.end()
+            field = match.group(1)
+            if field in template_fields:
+                self.parts.append((self.convert_separators(literal), field))
+                literal = ""
+            else:
+                literal += match.group(0)
+        literal += template[last:]
+        if literal != "":
+            self.parts.append((self.convert_separators(literal), None))
+        self.fields = tuple(field for literal, field in self.parts if field is not None)
+        if "ext" not in self.fields:
+            self.parts.append(("", "ext"))
+            self.fields += ("ext",)
+        self._last_key = None
+        self._last_path = ""
+
+    def convert_separators(self, literal):
+        # Only text at the very start can be the root of an absolute or UNC path
+        if len(self.parts) == 0:
+            return os_path(literal)
+        return _separator_pattern.sub(lambda match: os.sep, literal)
+
+    def resolve(self, values):
+        '''The file path for a dict of field values. Missing fields are empty.'''
+        key = tuple(values.get(field, "") for field in self.fields)
+        if key == self._last_key:
+            return self._last_path
+
+        resolved = dict(zip(self.fields, key))
+        directory = os_path(resolved.get("dir", ""))
+        if len(directory) > 1:
+            directory = directory.rstrip(os.sep)
+
+        path = ""
+        for literal, field in self.parts:
+            if field is None:
+                path += literal
+                continue
+            if field == "dir":
+                value = directory
+            elif field == "ext":
+                value = resolved[field]
+            else:
+                value = clean_name(resolved[field])
+            if value == "":
+                if literal[-1:] in _separators:
+                    literal = literal[:-1]
+                path += literal
+                continue
+            if literal.startswith(os.sep) and path.endswith(os.sep):
+                literal = literal[len(os.sep):]
+            path += literal + value
+
+        # No directory (an unsaved file) gives a relative path instead of one at the root
+        if "dir" in self.fields and directory == "":
+            path = path.lstrip(os.sep)
+
+        self._last_key = key
+        self._last_path = path
+        return path
+
+compiled_templates = {}
+
+def get_template(template):
+    '''The compiled template for a template string, compiled on first use.'''
+    compiled = compiled_templates.get(template)
+    if compiled is None:
+        compiled = LLUVHelpers_FilepathTemplate(template)
+        compiled_templates[template] = compiled
+    return compiled
@@ -0,0 +1,181 @@
+import bpy
+from bpy.app.handlers import persistent
+
+# Image usage index.
+# Records which textures, node groups and materials reference each image, and which objects use
+# those materials, in one pass over bpy.data. After that, only IDs Blender flags as updated are
+# scanned again, and the image -> users lookup is rebuilt lazily when something changed.
+
+def node_tree_refs(node_tree):
+    '''(image names, texture names, node group names) used directly by a node tree.'''
+    images = set()
+    textures = set()
+    groups = set()
+    if node_tree is None:
+        return images, textures, groups
+    for node in node_tree.nodes:
+        image = getattr(node, "image", None)
+        if image is not None:
+            images.add(image.name)
+        texture = getattr(node, "texture", None)
+        if texture is not None:
+            textures.add(texture.name)
+        if node.type == "GROUP" and node.node_tree is not None:
+            groups.add(node.node_tree.name)
+    return images, textures, groups
+
+def material_refs(material):
+    images, textures, groups = node_tree_refs(material.node_tree if material.use_nodes else None)
+    for slot in material.texture_slots:
+        if slot is not None and slot.texture is not None:
+            textures.add(slot.texture.name)
+    return images, textures, groups
+
+class LLUVHelpers_ImageUsers:
+    '''Names of the materials, textures and objects that use one image.'''
+    def __init__(self):
+        self.materials = set()
+        self.textures = set()
+        self.objects = set()
+
+    @property
+    def total(self):
+        return len(self.materials) + len(self.textures) + len(self.objects)
+
+class LLUVHelpers_ImageUsageIndex:
+    def __init__(self):
+        self.texture_images = {}
+        self.group_refs = {}
+        self.material_refs = {}
+        self.object_materials = {}
+        self.image_names = set()
+        self.built = False
+        self._users = None
+
+    def clear(self):
+        self.texture_images.clear()
+        self.group_refs.clear()
+        self.material_refs.clear()
+        self.object_materials.clear()
+        self.image_names.clear()
+        self.built = False
+        self._users = None
+
+    def scan_texture(self, texture):
+        image = getattr(texture, "image", None)
+        self.texture_images[texture.name] = image.name if image is not None else None
+
+    def scan_group(self, group):
+        self.group_refs[group.name] = node_tree_refs(group)
+
+    def scan_material(self, material):
+        self.material_refs[material.name] = material_refs(material)
+
+    def scan_object(self, obj):
+        self.object_materials[obj.name] = set(slot.material.name for slot in obj.material_slots if slot.material is not None)
+
+    def build(self, data):
+        self.clear()
+        for texture in data.textures:
+            self.scan_texture(texture)
+        for group in data.node_groups:
+            self.scan_group(group)
+        for material in data.materials:
+            self.scan_material(material)
+        for obj in data.objects:
+            self.scan_object(obj)
+        self.image_names = set(data.images.keys())
+        self.built = True
+
+    def refresh(self, data):
+        '''Rescan the IDs Blender flagged as updated. Call from a scene update handler.'''
+        if not self.built:
+            return
+        # Renamed images leave stale names in every reference to them
+        if self.image_names != set(data.images.keys()):
+            self.build(data)
+            return
+        changed = False
+        for collection, scan, refs in ((data.textures, self.scan_texture, self.texture_images),
+                (data.node_groups, self.scan_group, self.group_refs),
+                (data.materials, self.scan_material, self.material_refs),
+                (data.objects, self.scan_object, self.object_materials)):
+            if len(collection) != len(refs) or refs.keys() != set(collection.keys()):
+                # Added, removed or renamed IDs are cheapest to handle with a full rebuild
+                self.build(data)
+                return
+            if collection.is_updated:
+                for item in collection:
+                    if item.is_updated:
+                        scan(item)
+                        changed = True
+        if changed:
+            self._users = None
+
+    def _group_images(self, name, seen):
+        images, textures, groups = self.group_refs.get(name, (set(), set(), set()))
+        images = set(images)
+        textures = set(textures)
+        for group in groups:
+            if group not in seen:
+                seen.add(group)
+                sub_images, sub_textures = self._group_images(group, seen)
+                images |= sub_images
+                textures |= sub_textures
+        return images, textures
+
+    def users(self):
+        '''image name -> LLUVHelpers_ImageUsers, rebuilt only when the index changed.'''
+        if self._users is not None:
+            return self._users
+        users = {}
+        def get(image_name):
+            entry = users.get(image_name)
+            if entry is None:
+                entry = users[image_name] = LLUVHelpers_ImageUsers()
+            return entry
+
+        for texture, image in self.texture_images.items():
+            if image is not None:
+                get(image).textures.add(texture)
+
+        material_images = {}
+        for material, (images, textures, groups) in self.material_refs.items():
+            images = set(images)
+            textures = set(textures)
+            for group in groups:
+                group_images, group_textures = self._group_images(group, set([group]))
+                images |= group_images
+                textures |= group_textures
+            images.update(self.texture_images[texture] for texture in textures if self.texture_images.get(texture) is not None)
+            material_images[material] = images
+            for image in images:
+                get(image).materials.add(material)
+
+        for obj, materials in self.object_materials.items():
+            for material in materials:
+                for image in material_images.get(material, ()):
+                    get(image).objects.add(obj)
+
+        self._users = users
+        return users
+
+    def get_users(self, image_name):
+        return self.users().get(image_name)
+
+    def images_used_by(self, object_names):
+        '''Names of every image used by the given objects.'''
+        object_names = set(object_names)
+        return set(image for image, entry in self.users().items() if not entry.objects.isdisjoint(object_names))
+
+image_usage = LLUVHelpers_ImageUsageIndex()
+
+def get_image_usage(data=None):
+    '''The image usage index, built on first use.'''
+    if not image_usage.built:
+        image_usage.build(data or bpy.data)
+    return image_usage
+
+@persistent
+def refresh_image_usage(scene):
+    image_usage.refresh(bpy.data)
@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import numpy as np
 from bpy.utils import register_class
 from bpy.utils import unregister_class
 from bpy.types import (
@@ -20,6 +21,8 @@ from bpy.props import (
         EnumProperty
         )
 
+from . import uv_helpers_arrays
+
 bl_info = {
     "name": "3D View Selection Helpers",
     "author": "LaughingLeader",
@@ -34,8 +37,109 @@ bl_info = {
     "category": "View3D"
 }
 
+# Group membership is packed into int vertex layers on the mesh, one bit per vertex per group,
+# so up to 32 groups share a single layer. Each group owns a slot (its layer and bit).
+# Slots belong to the mesh, so objects sharing a mesh (linked duplicates) never use the same one.
+# Older files stored each group in its own int layer named after its group_id. Those groups are
+# moved into the packed layers, and their old layer removed, the first time the groups are used.
+# Mesh.vertex_layers_int has no remove(), so the old layers are removed through BMesh.
+
+packed_layer_name = "llselectiongroups_{}"
+bits_per_layer = 32
+
+def slot_layer_name(slot):
+    return packed_layer_name.format(slot // bits_per_layer)
+
+def slot_mask(slot):
+    '''The bit of a slot, as the signed value int layers store.'''
+    return np.uint32(1 << (slot % bits_per_layer)).view(np.int32)
+
+def read_int_layer(mesh, name):
+    '''Values of an int vertex layer, or None if the mesh doesn't have it.'''
+    layer = mesh.vertex_layers_int.get(name)
+    if layer is None:
+        return None
+    values = np.empty(len(mesh.vertices), dtype=np.int32)
+    layer.data.foreach_get("value", values)
+    return values
+
+def write_int_layer(mesh, name, values):
+    layer = mesh.vertex_layers_int.get(name) or mesh.vertex_layers_int.new(name=name)
+    layer.data.foreach_set("value", values)
+
+def group_members(mesh, group):
+    '''Mask of the vertices in a packed group.'''
+    values = read_int_layer(mesh, slot_layer_name(group.slot)) if group.slot >= 0 else None
+    if values is None:
+        return np.zeros(len(mesh.vertices), dtype=bool)
+    return (values & slot_mask(group.slot)) != 0
+
+def needs_packing(obj):
+    return any(group.slot < 0 for group in obj.llselectiongroups.groups)
+
+def used_slots(mesh):
+    '''Slots taken by the groups of every object using mesh.'''
+    used = set()
+    for user in bpy.data.objects:
+        if user.data == mesh and hasattr(user, "llselectiongroups"):
+            used.update(group.slot for group in user.llselectiongroups.groups if group.slot >= 0)
+    return used
+
+def pack_groups(obj, mesh):
+    '''Give every group without a slot the lowest free one on the mesh, moving its old int layer into it.
+    mesh must be writable (see uv_helpers_arrays.editable_mesh_data).'''
+    groups = obj.llselectiongroups.groups
+    used = used_slots(mesh)
+    layers = {}
+    slots = []
+    legacy_names = []
+    for group in groups:
+        if group.slot >= 0:
+            continue
+        slot = 0
+        while slot in used:
+            slot += 1
+        used.add(slot)
+        slots.append((group, slot))
+
+        name = slot_layer_name(slot)
+        if name not in layers:
+            values = read_int_layer(mesh, name)
+            layers[name] = values if values is not None else np.zeros(len(mesh.vertices), dtype=np.int32)
+        values = layers[name]
+        mask = slot_mask(slot)
+        # The slot may still hold the bits of a removed group
+        values &= ~mask
+        old_values = read_int_layer(mesh, group.group_id)
+        if old_values is not None:
+            values[old_values != 0] |= mask
+            legacy_names.append(group.group_id)
+
+    for name, values in layers.items():
+        write_int_layer(mesh, name, values)
+    # Only count groups as packed once their bits are written
+    for group, slot in slots:
+        group.slot = slot
+
+    if len(legacy_names) > 0:
+        remove_int_layers(mesh, legacy_names)
+
+def remove_int_layers(mesh, names):
+    '''Remove int vertex layers from an object-mode mesh.'''
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        for name in names:
+            layer = bm.verts.layers.int.get(name)
+            if layer is not None:
+                bm.verts.layers.int.remove(layer)
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+
 class LLObjectSelectionGroup(PropertyGroup):
     group_id = StringProperty(options={"HIDDEN"})
+    slot = IntProperty(options={"HIDDEN"}, default=-1)
     name = StringProperty(
             name="Name",
             description="The name of the selection group",
@@ -172,18 +276,23 @@ class LLObjectSelectionGroup_AssignOperatorBase(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.object
-
-        mesh = obj.data
-        bm = bmesh.from_edit_mesh(mesh)
-
         group = obj.llselectiongroups.groups[obj.llselectiongroups.active_index]
-        group_data = (bm.verts.layers.int.get(group.group_id) or bm.verts.layers.int.new(group.group_id))
-        
-        for v in bm.verts:
-            if v.select:
-                v[group_data] = 1 if self.mode == "ADD" else 0
 
-        bmesh.update_edit_mesh(obj.data)
+        with uv_helpers_arrays.editable_mesh_data(obj) as mesh:
+            pack_groups(obj, mesh)
+            name = slot_layer_name(group.slot)
+            values = read_int_layer(mesh, name)
+            if values is None:
+                values = np.zeros(len(mesh.vertices), dtype=np.int32)
+            vert_select = np.empty(len(mesh.vertices), dtype=bool)
+            mesh.vertices.foreach_get("select", vert_select)
+
+            mask = slot_mask(group.slot)
+            if self.mode == "ADD":
+                values[vert_select] |= mask
+            else:
+                values[vert_select] &= ~mask
+            write_int_layer(mesh, name, values)
 
         return {'FINISHED'}
 
@@ -211,18 +320,19 @@ class LLObjectSelectionGroup_BaseSelectOperator(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.object
-
-        mesh = obj.data
-        bm = bmesh.from_edit_mesh(mesh)
-
         group = obj.llselectiongroups.groups[obj.llselectiongroups.active_index]
-        group_data = bm.verts.layers.int.get(group.group_id)
-        if group_data:
-            for v in bm.verts:
-                if v[group_data] == 1:
-                    v.select = self.mode == "SELECT"
-            bm.select_flush_mode()
-            bmesh.update_edit_mesh(obj.data)
+
+        if needs_packing(obj):
+            with uv_helpers_arrays.editable_mesh_data(obj) as mesh:
+                pack_groups(obj, mesh)
+
+        arrays = uv_helpers_arrays.get_mesh_arrays(obj)
+        members = group_members(obj.data, group)
+        if np.any(members):
+            vert_select = arrays.vert_select.copy()
+            vert_select[members] = self.mode == "SELECT"
+            edge_select, face_select = uv_helpers_arrays.flush_vertex_selection(arrays, vert_select, arrays.edge_verts)
+            uv_helpers_arrays.write_selection(obj, vert_select, edge_select, face_select)
 
         return {'FINISHED'}
     
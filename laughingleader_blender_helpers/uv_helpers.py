@@ -1,16 +1,36 @@
 from __future__ import division
 import bpy
 import bmesh
+import hashlib
 import math
+import numpy as np
 import os.path
 import os
+import time
 
 from bpy.types import Operator, PropertyGroup, Panel
-from bpy.props import CollectionProperty, PointerProperty, BoolProperty, FloatProperty, EnumProperty, StringProperty
+from bpy.props import CollectionProperty, PointerProperty, BoolProperty, FloatProperty, EnumProperty, StringProperty, IntProperty, FloatVectorProperty
+from bpy_extras.io_utils import ExportHelper
 
 from bl_ui import space_image
+from collections import OrderedDict
+from bpy.app.handlers import persistent
 
 from . import leader
+from . import uv_helpers_arrays
+from . import uv_helpers_islands
+from . import uv_helpers_tangents
+from . import uv_helpers_splits
+from . import uv_helpers_density
+from . import uv_helpers_sanity
+from . import image_helpers_duplicates
+from . import image_helpers_export
+from . import image_helpers_index
+from . import image_helpers_template
+from . import image_helpers_memory
+from . import image_helpers_png
+from . import image_helpers_users
+from . import image_helpers_raster
 
 bl_info = {
     "name": "UV Helpers",
@@ -34,16 +54,6 @@ def error_missing_layer_names(self, context):
 def error_no_active_object(self, context):
     self.layout.label("No active object set.")
 
-class LLUVHelpers_TriangleError:
-    def __init__(self, face, vert1, vert2, vert3, uvloop1, uvloop2, uvloop3):
-        self.face = face
-        self.vert1 = vert1
-        self.vert2 = vert2
-        self.vert3 = vert3
-        self.loop1 = uvloop1
-        self.loop2 = uvloop2
-        self.loop3 = uvloop3
-
 class LLUVHelpers_BadTriangleCheckerOperator(Operator):
     """Check for UVs that will cause tangent/binormal issues.\nThese are UV faces that fail to form a mathematical triangle"""
     bl_idname = "uv.llhelpers_badtrianglechecker"
@@ -56,157 +66,705 @@ class LLUVHelpers_BadTriangleCheckerOperator(Operator):
     def poll(cls, context):
         return (context.mode == 'EDIT_MESH')
 
-    def uv_error(self, uv1, uv2, uv3):
-        s1 = float(uv2[0] - uv1[0]) # x
-        s2 = float(uv3[0] - uv1[0])
-        t1 = float(uv2[1] - uv1[1]) # y
-        t2 = float(uv3[1] - uv1[1])
-        
-        check1 = float(s1 * t2 - s2 * t1)
+    def uv_checkforerrors(self, context, objects):
+        preferences = leader.get_preferences(context)
+        set_errorchecker_select_mode(context)
 
-        is_error = abs(check1) < self.length_check_value
+        triangulation = "FAN"
+        if preferences is not None:
+            triangulation = preferences.uvhelpers_errorchecker_triangulation
+        select_all = preferences is not None and preferences.uvhelpers_errorchecker_select_all is True
+        incremental = preferences is None or preferences.uvhelpers_errorchecker_incremental
 
-        if is_error:
-            print("[LeaderHelpers] Found problematic UV triangle. Total: {0:.10f} < {1:.10f} Min".format(abs(check1), self.length_check_value))
-            print("  UV1: x:{} y:{}".format(uv1[0], uv1[1]))
-            print("  UV2: x:{} y:{}".format(uv2[0], uv2[1]))
-            print("  UV3: x:{} y:{}".format(uv3[0], uv3[1]))
+        results = uv_helpers_arrays.check_objects(objects, float(self.length_check_value), triangulation, incremental=incremental)
 
-        return is_error
+        print_errors = preferences is not None and preferences.uvhelpers_errorchecker_print_errors
+        check_sanity = preferences is None or preferences.uvhelpers_errorchecker_sanity
+        uv_range = 1.0
+        all_layers = False
+        if preferences is not None:
+            uv_range = preferences.uvhelpers_errorchecker_uv_range
+            all_layers = preferences.uvhelpers_errorchecker_all_layers
+
+        total_errors = 0
+        total_sanity = 0
+        total_faces = 0
+        error_objects = 0
+        can_select = True
+        for node in objects:
+            if node.name not in results:
+                self.report({"WARNING"}, "[LL-UV-Helper] Mesh '{}' has no UV map.".format(node.data.name))
+                continue
+
+            arrays, tris, polys, cross = results[node.name]
+            report = uv_helpers_arrays.LLUVHelpers_ErrorReport("Bad UV Triangles", node.name, arrays, tris, polys, cross)
+            uv_helpers_arrays.set_report(report)
+            node.data.llhelpers_uvreport.active_index = 0
+            node.data.llhelpers_uvreport.page = 0
+
+            if check_sanity:
+                # Same arrays as the triangle check, so this is only a few extra array passes
+                flags = uv_helpers_sanity.classify_faces(arrays, uv_range, all_layers)
+                total_sanity += uv_helpers_sanity.set_face_flags(arrays.mesh_name, flags).total
+
+            if print_errors:
+                if incremental:
+                    print("[LL-UV-Helper] '{}': Rechecked {}/{} faces.".format(node.name,
+                        uv_helpers_arrays.get_last_rechecked(arrays.mesh_name, arrays.uv_layer_name), arrays.total_polys))
+                if len(report) > 0:
+                    print(report.summary())
+
+            if len(tris) == 0:
+                uv_helpers_arrays.select_loops(node, arrays, np.zeros(0, dtype=np.int32))
+                continue
+
+            bad_polys = np.unique(polys)
+            total_errors += len(tris)
+            total_faces += len(bad_polys)
+            error_objects += 1
+
+            if not can_select:
+                uv_helpers_arrays.select_loops(node, arrays, np.zeros(0, dtype=np.int32))
+                continue
+
+            if not select_all:
+                bad_polys = bad_polys[:1]
+                can_select = False
+
+            uv_helpers_arrays.select_loops(node, arrays, uv_helpers_arrays.polygon_loops(arrays, bad_polys))
+
+        if total_sanity > 0:
+            self.report({"WARNING"}, "[LL-UV-Helper] {} faces with NaN, out of range or flipped UVs found.".format(total_sanity))
+
+        if total_errors > 0:
+            if len(objects) > 1:
+                self.report({"WARNING"}, "[LL-UV-Helper] {} total problems found ({} faces) on {}/{} objects. Check selected vertices for wrapping issues.".format(total_errors, total_faces, error_objects, len(objects)))
+            else:
+                self.report({"WARNING"}, "[LL-UV-Helper] {} total problems found on UV map ({} faces). Check selected vertices for wrapping issues.".format(total_errors, total_faces))
+            return True
+        else:
+            self.report({"INFO"}, "[LL-UV-Helper] No UV problems found.")
+        return False
 
-    def uv_checkforerrors(self, context, node):
-        if node.type == "MESH":
-            if (node.data is not None):
+    def execute(self, context):
+        objects = get_errorchecker_objects(self, context)
+        if len(objects) > 0:
+            self.uv_checkforerrors(context, objects)
 
-                preferences = leader.get_preferences(context)
-                if preferences is not None:
-                    select_mode = preferences.uvhelpers_errorchecker_select_mode
-                else:
-                    select_mode = "VERTEX"
+        return {'FINISHED'}
 
-                if select_mode == "FACE":
-                    bpy.context.tool_settings.mesh_select_mode = (False, False, True)
-                elif select_mode == "EDGE":
-                    bpy.context.tool_settings.mesh_select_mode = (False, True, False)
-                else:
-                    bpy.context.tool_settings.mesh_select_mode = (True, False, False)
-                #py.context.tool_settings.mesh_select_mode = (False, False, True)
-
-                mesh = node.data
-
-                bm = bmesh.from_edit_mesh(mesh)
-                bm.select_flush(False)
-                uv_layer = bm.loops.layers.uv.active
-
-                uv_errors = []
-
-                for face in bm.faces:
-                    if face in uv_errors:
-                        continue
-
-                    face.select = False
-                    
-                    if(len(face.loops) == 3):
-                        vloop1 = face.loops[0]
-                        vloop2 = face.loops[1]
-                        vloop3 = face.loops[2]
-
-                        vert1 = vloop1.vert
-                        vert2 = vloop2.vert
-                        vert3 = vloop3.vert
-
-                        vert1.select_set(False)
-                        vert2.select_set(False)
-                        vert3.select_set(False)
-                        
-                        uvloop1 = vloop1[uv_layer]
-                        uvloop2 = vloop2[uv_layer]
-                        uvloop3 = vloop3[uv_layer]
-
-                        uv1 = uvloop1.uv
-                        uv2 = uvloop2.uv
-                        uv3 = uvloop3.uv
-
-                        #uv1 = vert1.co.xy
-                        #uv2 = vert2.co.xy
-                        #uv3 = vert3.co.xy
-
-                        if self.uv_error(uv1, uv2, uv3):
-                            uv_error_entry = LLUVHelpers_TriangleError(face, vert1, vert2, vert3, uvloop1, uvloop2, uvloop3)
-                            uv_errors.append(uv_error_entry)
-                        
-                total_errors = len(uv_errors)
-                if total_errors > 0:
-                    can_select = True
-                    select_all = preferences is not None and preferences.uvhelpers_errorchecker_select_all is True
-                    for uv_error in uv_errors:
-                        print("[ERROR]: UV problem detected!")
-                        print("  Vert1: (%f,%f,%f)" % uv_error.vert1.co[:])
-                        print("  Vert2: (%f,%f,%f)" % uv_error.vert2.co[:])
-                        print("  Vert3: (%f,%f,%f)" % uv_error.vert3.co[:])
-                        print("  UV1: (%f,%f)" % uv_error.loop1.uv[:])
-                        print("  UV2: (%f,%f)" % uv_error.loop2.uv[:])
-                        print("  UV3: (%f,%f)" % uv_error.loop3.uv[:])
-
-                        if can_select:
-                            uv_error.vert1.select_set(True)
-                            uv_error.vert2.select_set(True)
-                            uv_error.vert3.select_set(True)
-                            uv_error.loop1.select = True
-                            uv_error.loop2.select = True
-                            uv_error.loop3.select = True
-                            if select_all == False:
-                                can_select = False
-                                break
-
-                    self.report({"WARNING"}, "[LL-UV-Helper] {} total problems found on UV map. Check selected vertices for wrapping issues.".format(total_errors))
-                    bm.select_flush(True)
-                    bmesh.update_edit_mesh(mesh)
-                    return True
-                else:
-                    self.report({"INFO"}, "[LL-UV-Helper] No UV problems found.")
-                    bm.select_flush(True)
-                    bmesh.update_edit_mesh(mesh)
-        return False
+class LLUVHelpers_ReportCheckerOperatorBase:
+    '''Shared execute/report logic for the checkers. Not an Operator itself, so it isn't registered.'''
+    bl_options = {'REGISTER', 'UNDO'}
+    report_label = ""
+    value_format = "{:.10f}"
+    problem_message = "[LL-UV-Helper] {} problem faces found."
+    success_message = "[LL-UV-Helper] No problems found."
 
-    def execute(self, context):
-        scene = context.scene
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH')
 
-        if bpy.context.scene.objects.active is None:
-            self.report({"WARNING"}, "[LL-UV-Helper] Select a mesh before checking UVs!")
+    def run_check(self, context, objects, preferences, triangulation):
+        '''Returns an OrderedDict of object name -> (arrays, (triangles, polygons, values)).'''
+        return {}
+
+    def first_polys(self, polys, values):
+        '''The faces to select when "Select All Problems" is disabled.'''
+        return polys[:1]
+
+    def execute(self, context):
+        objects = get_errorchecker_objects(self, context)
+        if len(objects) == 0:
             return {'FINISHED'}
 
-        node = bpy.context.scene.objects.active
+        preferences = leader.get_preferences(context)
+        set_errorchecker_select_mode(context)
+        triangulation = "FAN"
+        if preferences is not None:
+            triangulation = preferences.uvhelpers_errorchecker_triangulation
+        select_all = preferences is not None and preferences.uvhelpers_errorchecker_select_all is True
+        print_errors = preferences is not None and preferences.uvhelpers_errorchecker_print_errors
+
+        results = self.run_check(context, objects, preferences, triangulation)
+
+        total_faces = 0
+        can_select = True
+        for node in objects:
+            if node.name not in results:
+                self.report({"WARNING"}, "[LL-UV-Helper] Mesh '{}' has no UV map.".format(node.data.name))
+                continue
+
+            arrays, (tris, polys, values) = results[node.name]
+            report = uv_helpers_arrays.LLUVHelpers_ErrorReport(self.report_label, node.name, arrays, tris, polys, values, self.value_format)
+            uv_helpers_arrays.set_report(report)
+            node.data.llhelpers_uvreport.active_index = 0
+            node.data.llhelpers_uvreport.page = 0
+            if print_errors and len(report) > 0:
+                print(report.summary())
+
+            bad_polys = np.unique(polys)
+            total_faces += len(bad_polys)
+            if not can_select or len(bad_polys) == 0:
+                uv_helpers_arrays.select_loops(node, arrays, np.zeros(0, dtype=np.int32))
+                continue
+            if not select_all:
+                bad_polys = np.unique(self.first_polys(polys, values))
+                can_select = False
+            uv_helpers_arrays.select_loops(node, arrays, uv_helpers_arrays.polygon_loops(arrays, bad_polys))
+
+        if total_faces > 0:
+            self.report({"WARNING"}, self.problem_message.format(total_faces))
+        else:
+            self.report({"INFO"}, self.success_message)
+        return {'FINISHED'}
+
+class LLUVHelpers_OverlapCheckerOperator(LLUVHelpers_ReportCheckerOperatorBase, Operator):
+    """Check for UV faces that overlap other UV faces.\nOverlaps break lightmaps and baked maps"""
+    bl_idname = "uv.llhelpers_overlapchecker"
+    bl_label = "Check UV Overlaps"
+    report_label = "UV Overlaps"
+    value_format = "overlaps face {:.0f}"
+    problem_message = "[LL-UV-Helper] {} overlapping UV faces found."
+    success_message = "[LL-UV-Helper] No overlapping UVs found."
+
+    def run_check(self, context, objects, preferences, triangulation):
+        prefetch = ("vert_coords",) if triangulation == "SHORTEST_DIAGONAL" else ()
+        return uv_helpers_arrays.map_objects(objects, uv_helpers_arrays.find_overlaps, (triangulation,), prefetch)
+
+    def first_polys(self, polys, values):
+        # The first face and the face it overlaps
+        return np.array([polys[0], values[0]], dtype=np.int32)
+
+class LLUVHelpers_TangentCheckerOperator(LLUVHelpers_ReportCheckerOperatorBase, Operator):
+    """Check for UV triangles that produce broken tangent frames.\nFlags degenerate, nearly parallel and mirrored tangent/bitangent pairs"""
+    bl_idname = "uv.llhelpers_tangentchecker"
+    bl_label = "Check Tangent Frames"
+    report_label = "Tangent Frames"
+    value_format = staticmethod(uv_helpers_tangents.format_problems)
+    problem_message = "[LL-UV-Helper] {} faces with broken tangent frames found."
+    success_message = "[LL-UV-Helper] No tangent frame problems found."
+
+    def run_check(self, context, objects, preferences, triangulation):
+        min_angle = 5.0
+        if preferences is not None:
+            min_angle = preferences.uvhelpers_errorchecker_tangent_angle
+        prefetch = ("vert_coords", "loop_edges", "edge_seams", "poly_areas")
+        return uv_helpers_arrays.map_objects(objects, uv_helpers_tangents.find_bad_tangent_frames, (triangulation, min_angle), prefetch)
+
+class LLUVHelpers_TexelDensityCheckerOperator(LLUVHelpers_ReportCheckerOperatorBase, Operator):
+    """Check UV texel density against a target density.\nFaces or islands outside the tolerance are reported"""
+    bl_idname = "uv.llhelpers_texeldensitychecker"
+    bl_label = "Check Texel Density"
+    report_label = "Texel Density"
+    value_format = "{:.2f} px/unit"
+    problem_message = "[LL-UV-Helper] {} faces outside the texel density tolerance found."
+    success_message = "[LL-UV-Helper] Texel density is within tolerance."
+
+    def run_check(self, context, objects, preferences, triangulation):
+        resolution = 1024
+        target = 0.0
+        tolerance = 10.0
+        use_islands = True
+        if preferences is not None:
+            resolution = preferences.uvhelpers_errorchecker_texel_resolution
+            target = preferences.uvhelpers_errorchecker_texel_density
+            tolerance = preferences.uvhelpers_errorchecker_texel_tolerance
+            use_islands = preferences.uvhelpers_errorchecker_texel_islands
+
+        prefetch = ("vert_coords", "loop_edges", "edge_seams", "poly_areas")
+        results = uv_helpers_arrays.map_objects(objects, uv_helpers_density.LLUVHelpers_TexelDensity, (resolution,), prefetch)
+        if len(results) == 0:
+            return results
+        if target <= 0:
+            target = uv_helpers_density.combined_density([density for arrays, density in results.values()])
+
+        print_errors = preferences is not None and preferences.uvhelpers_errorchecker_print_errors
+        checked = OrderedDict()
+        for name, (arrays, density) in results.items():
+            density.target = target
+            uv_helpers_density.set_density(density)
+            if print_errors:
+                print("[LL-UV-Helper] '{}': Texel density min {:.2f} | max {:.2f} | mean {:.2f} px/unit (target {:.2f}).".format(
+                    name, density.min_density, density.max_density, density.mean_density, target))
+            polys = density.outliers(target, tolerance / 100.0, use_islands).astype(np.int32)
+            tris, tri_polys = uv_helpers_arrays.triangulate(arrays, triangulation, polys)
+            checked[name] = (arrays, (tris, tri_polys, density.face_values(use_islands)[tri_polys]))
+        return checked
+
+class LLUVHelpers_UVSanityCheckerOperator(LLUVHelpers_ReportCheckerOperatorBase, Operator):
+    """Check for NaN/infinite UVs, UVs far outside the 0-1 range, and flipped UV faces"""
+    bl_idname = "uv.llhelpers_uvsanitychecker"
+    bl_label = "Check UV Sanity"
+    report_label = "UV Sanity"
+    value_format = staticmethod(uv_helpers_sanity.format_problems)
+    problem_message = "[LL-UV-Helper] {} faces with NaN, out of range or flipped UVs found."
+    success_message = "[LL-UV-Helper] No NaN, out of range or flipped UVs found."
+
+    def run_check(self, context, objects, preferences, triangulation):
+        uv_range = 1.0
+        all_layers = False
+        if preferences is not None:
+            uv_range = preferences.uvhelpers_errorchecker_uv_range
+            all_layers = preferences.uvhelpers_errorchecker_all_layers
+        prefetch = ("all_uvs",) if all_layers else ()
+        return uv_helpers_arrays.map_objects(objects, uv_helpers_sanity.find_uv_problems, (triangulation, uv_range, all_layers), prefetch)
+
+class LLUVHelpers_UVSanitySelectOperator(Operator):
+    """Select the faces found by the last UV sanity check in one category"""
+    bl_idname = "uv.llhelpers_uvsanity_select"
+    bl_label = "Select UV Problems"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    category = EnumProperty(name="Category", items=uv_helpers_sanity.problem_categories, default="NON_FINITE")
+
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH' and context.object is not None and context.object.type == "MESH"
+            and uv_helpers_sanity.get_face_problems(context.object.data.name) is not None)
 
-        bpy.ops.object.mode_set(mode="EDIT")
-        self.uv_checkforerrors(context, node)
+    def execute(self, context):
+        obj = context.object
+        problems = uv_helpers_sanity.get_face_problems(obj.data.name)
+        arrays = uv_helpers_arrays.get_mesh_arrays(obj)
+        if arrays.total_polys != len(problems.flags):
+            self.report({"WARNING"}, "[LL-UV-Helper] The mesh changed since the last check. Check the UVs again.")
+            return {'FINISHED'}
 
+        polys = problems.faces(self.category)
+        context.tool_settings.mesh_select_mode = (False, False, True)
+        uv_helpers_arrays.select_loops(obj, arrays, uv_helpers_arrays.polygon_loops(arrays, polys))
+        self.report({"INFO"}, "[LL-UV-Helper] Selected {} faces.".format(len(polys)))
         return {'FINISHED'}
 
-def selectedUVs(mesh, bmesh=None, uvlayer=None, sync=False):
-    '''Get the vertices visible and selected in the UV view.'''
-    uvs = {}
-    if bmesh is None:
-        uvlayer = uvlayer or mesh.uv_layers.active
-        for f, uv in zip(mesh.loops, uvlayer.data):
-            #print("UVLayer: {} | f: {} uv: {}".format(uvlayer.name, f, uv))
-            if mesh.vertices[f.vertex_index].select and (sync or uv.select):
-                uvs[f.vertex_index] = uv.uv
-                #uvs.append(uv.uv)
+def draw_uv_sanity(layout, context):
+    obj = context.object
+    if obj is None or obj.type != "MESH" or obj.data is None:
+        return
+    problems = uv_helpers_sanity.get_face_problems(obj.data.name)
+    if problems is None or problems.total == 0:
+        return
+
+    col = layout.column(align=True)
+    for category, name, description in uv_helpers_sanity.problem_categories:
+        count = problems.counts[category]
+        if count > 0:
+            row = col.row(align=True)
+            row.label("{}: {} faces".format(name, count))
+            op = row.operator(LLUVHelpers_UVSanitySelectOperator.bl_idname, text="", icon="RESTRICT_SELECT_OFF")
+            op.category = category
+
+def draw_texel_density(layout, context):
+    obj = context.object
+    if obj is None:
+        return
+    density = uv_helpers_density.get_density(obj.name)
+    if density is None:
+        return
+
+    col = layout.column(align=True)
+    col.label("Texel Density ({}px): {:.2f} px/unit".format(density.resolution, density.mean_density))
+    col.label("  Min {:.2f} | Max {:.2f} | Target {:.2f}".format(density.min_density, density.max_density, density.target))
+
+def set_errorchecker_select_mode(context):
+    preferences = leader.get_preferences(context)
+    if preferences is not None:
+        select_mode = preferences.uvhelpers_errorchecker_select_mode
+    else:
+        select_mode = "VERTEX"
+
+    if select_mode == "FACE":
+        context.tool_settings.mesh_select_mode = (False, False, True)
+    elif select_mode == "EDGE":
+        context.tool_settings.mesh_select_mode = (False, True, False)
     else:
-        uv_layer = uvlayer or bmesh.loops.layers.uv.active
+        context.tool_settings.mesh_select_mode = (True, False, False)
+
+def get_errorchecker_objects(operator, context):
+    '''The active mesh, plus every selected mesh if "Check All Selected" is enabled.'''
+    node = context.scene.objects.active
+    if node is None:
+        operator.report({"WARNING"}, "[LL-UV-Helper] Select a mesh before checking UVs!")
+        return []
+
+    bpy.ops.object.mode_set(mode="EDIT")
+
+    objects = []
+    if node.type == "MESH" and node.data is not None:
+        objects.append(node)
+
+    preferences = leader.get_preferences(context)
+    if preferences is not None and preferences.uvhelpers_errorchecker_all_selected:
+        for obj in context.selected_objects:
+            if obj != node and obj.type == "MESH" and obj.data is not None:
+                objects.append(obj)
+    return objects
+
+class LLUVHelpers_ErrorReportSettings(PropertyGroup):
+    active_index = IntProperty(options={"HIDDEN"}, default=0)
+    page = IntProperty(options={"HIDDEN"}, default=0)
+    island_index = IntProperty(name="Island", description="The UV island to select", default=0, min=0)
+
+    @classmethod
+    def register(cls):
+        bpy.types.Mesh.llhelpers_uvreport = PointerProperty(
+            name="UV Error Report",
+            description="",
+            type=cls
+        )
+
+    @classmethod
+    def unregister(cls):
+        try:
+            del bpy.types.Mesh.llhelpers_uvreport
+        except: pass
+
+UV_REPORT_PAGE_SIZE = 10
+
+def get_active_report(context):
+    obj = context.object
+    if obj is not None and obj.type == "MESH" and obj.data is not None:
+        return uv_helpers_arrays.get_report(obj.data.name)
+    return None
+
+def select_report_face(context, obj, poly):
+    '''Select a single face (and its UVs) in edit mode, then frame it.'''
+    bpy.ops.mesh.select_all(action="DESELECT")
+    bm = bmesh.from_edit_mesh(obj.data)
+    bm.faces.ensure_lookup_table()
+    face = bm.faces[poly]
+    face.select_set(True)
+    uv_layer = bm.loops.layers.uv.active
+    if uv_layer is not None:
+        for loop in face.loops:
+            loop[uv_layer].select = True
+    bmesh.update_edit_mesh(obj.data)
+
+    if context.area is not None:
+        if context.area.type == "IMAGE_EDITOR":
+            bpy.ops.image.view_selected()
+        elif context.area.type == "VIEW_3D":
+            bpy.ops.view3d.view_selected()
+
+class LLUVHelpers_ErrorReportGotoOperator(Operator):
+    """Select and frame a problem from the last UV check"""
+    bl_idname = "uv.llhelpers_uvreport_goto"
+    bl_label = "Go To UV Problem"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    index = IntProperty(default=-1, options={"HIDDEN"})
+    step = IntProperty(default=0, options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        report = get_active_report(context)
+        return context.mode == 'EDIT_MESH' and report is not None and len(report) > 0
+
+    def execute(self, context):
+        obj = context.object
+        report = get_active_report(context)
+        settings = obj.data.llhelpers_uvreport
+
+        if self.index > -1:
+            index = self.index
+        else:
+            index = settings.active_index + self.step
+        index = index % len(report)
+
+        settings.active_index = index
+        settings.page = index // UV_REPORT_PAGE_SIZE
+
+        bm = bmesh.from_edit_mesh(obj.data)
+        if len(bm.faces) != report.total_polys:
+            self.report({"WARNING"}, "[LL-UV-Helper] The mesh changed since the last check. Run the check again.")
+            return {'CANCELLED'}
+
+        select_report_face(context, obj, int(report.polys[index]))
+        return {'FINISHED'}
+
+class LLUVHelpers_ErrorReportPageOperator(Operator):
+    """Show the next or previous page of problems"""
+    bl_idname = "uv.llhelpers_uvreport_page"
+    bl_label = "Change Page"
+
+    step = IntProperty(default=1, options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        return get_active_report(context) is not None
+
+    def execute(self, context):
+        report = get_active_report(context)
+        settings = context.object.data.llhelpers_uvreport
+        total_pages = max(1, int(math.ceil(len(report) / UV_REPORT_PAGE_SIZE)))
+        settings.page = (settings.page + self.step) % total_pages
+        return {'FINISHED'}
+
+def draw_error_report(layout, context):
+    report = get_active_report(context)
+    if report is None:
+        return
+
+    settings = context.object.data.llhelpers_uvreport
+    box = layout.box()
+    if len(report) == 0:
+        box.label("{}: No problems found.".format(report.label))
+        return
+
+    box.label("{}: {} ({} faces)".format(report.label, len(report), report.total_faces), icon="ERROR")
+
+    row = box.row(align=True)
+    op = row.operator(LLUVHelpers_ErrorReportGotoOperator.bl_idname, text="", icon="TRIA_LEFT")
+    op.step = -1
+    row.label("{}/{}".format(min(settings.active_index, len(report) - 1) + 1, len(report)))
+    op = row.operator(LLUVHelpers_ErrorReportGotoOperator.bl_idname, text="", icon="TRIA_RIGHT")
+    op.step = 1
+
+    total_pages = max(1, int(math.ceil(len(report) / UV_REPORT_PAGE_SIZE)))
+    page = min(settings.page, total_pages - 1)
+    col = box.column(align=True)
+    start = page * UV_REPORT_PAGE_SIZE
+    for i in range(start, min(start + UV_REPORT_PAGE_SIZE, len(report))):
+        text = "Face {}: {}".format(report.polys[i], report.format_value(i))
+        op = col.operator(LLUVHelpers_ErrorReportGotoOperator.bl_idname, text=text, emboss=(i == settings.active_index))
+        op.index = i
+
+    if total_pages > 1:
+        row = box.row(align=True)
+        op = row.operator(LLUVHelpers_ErrorReportPageOperator.bl_idname, text="", icon="TRIA_LEFT")
+        op.step = -1
+        row.label("Page {}/{}".format(page + 1, total_pages))
+        op = row.operator(LLUVHelpers_ErrorReportPageOperator.bl_idname, text="", icon="TRIA_RIGHT")
+        op.step = 1
+
+def get_active_islands(context):
+    obj = context.object
+    if obj is not None and obj.type == "MESH" and obj.data is not None:
+        return uv_helpers_islands.get_islands(obj.data.name)
+    return None
+
+class LLUVHelpers_IslandsBuildOperator(Operator):
+    """Find the UV islands of the active mesh"""
+    bl_idname = "uv.llhelpers_uvislands_build"
+    bl_label = "Find UV Islands"
+
+    use_seams = BoolProperty(name="Split at Seams", description="Treat seams as island boundaries, even when the UVs are connected", default=True)
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
+    def execute(self, context):
+        obj = context.object
+        arrays = uv_helpers_arrays.get_mesh_arrays(obj)
+        if arrays.uvs is None:
+            self.report({"WARNING"}, "[LL-UV-Helper] Mesh '{}' has no UV map.".format(obj.data.name))
+            return {'CANCELLED'}
+
+        islands = uv_helpers_islands.build_islands(arrays, self.use_seams)
+        obj.data.llhelpers_uvreport.island_index = 0
+        self.report({"INFO"}, "[LL-UV-Helper] Found {} UV islands on '{}'.".format(len(islands), obj.name))
+        return {'FINISHED'}
+
+class LLUVHelpers_IslandsSelectOperator(Operator):
+    """Select the faces of a UV island"""
+    bl_idname = "uv.llhelpers_uvislands_select"
+    bl_label = "Select Island"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        islands = get_active_islands(context)
+        return context.mode == 'EDIT_MESH' and islands is not None and len(islands) > 0
+
+    def execute(self, context):
+        obj = context.object
+        islands = get_active_islands(context)
+        index = obj.data.llhelpers_uvreport.island_index
+        if index >= len(islands):
+            self.report({"WARNING"}, "[LL-UV-Helper] Island {} does not exist, there are {} islands.".format(index, len(islands)))
+            return {'CANCELLED'}
+
+        arrays = uv_helpers_arrays.get_mesh_arrays(obj, islands.uv_layer_name)
+        if arrays.total_polys != islands.total_polys:
+            self.report({"WARNING"}, "[LL-UV-Helper] The mesh changed since the islands were found. Find them again.")
+            return {'CANCELLED'}
+
+        uv_helpers_arrays.select_loops(obj, arrays, uv_helpers_arrays.polygon_loops(arrays, islands.faces(index)), islands.uv_layer_name)
+        return {'FINISHED'}
+
+class LLUVHelpers_VertexEstimateOperator(Operator):
+    """Predict how many vertices the mesh will have once exported.\nVertices are split wherever UVs, split normals or tangent signs differ"""
+    bl_idname = "uv.llhelpers_estimatevertices"
+    bl_label = "Estimate Export Vertices"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_normals = BoolProperty(name="Split Normals", description="Count split normals as a reason to split vertices", default=True)
+    use_tangents = BoolProperty(name="Tangent Signs", description="Count mirrored tangent signs as a reason to split vertices", default=True)
+    min_splits = IntProperty(name="Select Splits", description="Select vertices that are split into at least this many exported vertices (0 to disable)", default=3, min=0)
+
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH')
+
+    def execute(self, context):
+        objects = get_errorchecker_objects(self, context)
+        if len(objects) == 0:
+            return {'FINISHED'}
+
+        preferences = leader.get_preferences(context)
+        triangulation = "FAN"
+        print_errors = False
+        if preferences is not None:
+            triangulation = preferences.uvhelpers_errorchecker_triangulation
+            print_errors = preferences.uvhelpers_errorchecker_print_errors
+
+        prefetch = ("all_uvs", "vert_coords", "loop_normals") if self.use_normals else ("all_uvs", "vert_coords")
+        results = uv_helpers_arrays.map_objects(objects, uv_helpers_splits.estimate_vertex_count,
+            (triangulation, self.use_normals, self.use_tangents), prefetch)
+
+        total = 0
+        total_verts = 0
+        for node in objects:
+            if node.name not in results:
+                continue
+            arrays, estimate = results[node.name]
+            uv_helpers_splits.set_estimate(estimate)
+            total += estimate.total
+            total_verts += estimate.total_verts
+            if print_errors:
+                print("[LL-UV-Helper] '{}': {} exported vertices ({} in Blender, max {} splits per vertex). {}".format(
+                    node.name, estimate.total, estimate.total_verts, estimate.max_splits,
+                    " | ".join("{}: {}".format(name, count) for name, count in estimate.layer_totals.items())))
+
+            if self.min_splits > 0:
+                context.tool_settings.mesh_select_mode = (True, False, False)
+                vert_select = np.zeros(arrays.total_verts, dtype=bool)
+                vert_select[estimate.worst_verts(self.min_splits)] = True
+                edge_select, face_select = uv_helpers_arrays.flush_vertex_selection(arrays, vert_select, arrays.edge_verts)
+                uv_helpers_arrays.write_selection(node, vert_select, edge_select, face_select)
+
+        self.report({"INFO"}, "[LL-UV-Helper] Estimated {} exported vertices ({} in Blender) on {} objects.".format(total, total_verts, len(results)))
+        return {'FINISHED'}
+
+class LLUVHelpers_ExportLayoutOperator(Operator, ExportHelper):
+    """Export the UV layout of the active mesh as a PNG overlay.\nFaces from the last UV check are highlighted"""
+    bl_idname = "uv.llhelpers_exportlayout"
+    bl_label = "Export UV Overlay"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".png"
+    filter_glob = StringProperty(default="*.png", options={'HIDDEN'})
+
+    size = IntProperty(name="Size", description="Width and height of the image", default=2048, min=8, max=16384)
+    use_report = BoolProperty(name="Highlight Problems", description="Fill the faces found by the last UV check with the problem color", default=True)
+    fill_color = FloatVectorProperty(name="Fill", subtype="COLOR", size=4, min=0.0, max=1.0, default=(1.0, 1.0, 1.0, 0.25))
+    wire_color = FloatVectorProperty(name="Wire", subtype="COLOR", size=4, min=0.0, max=1.0, default=(1.0, 1.0, 1.0, 1.0))
+    error_color = FloatVectorProperty(name="Problems", subtype="COLOR", size=4, min=0.0, max=1.0, default=(1.0, 0.0, 0.0, 0.75))
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH" and context.object.data is not None
+
+    def execute(self, context):
+        obj = context.object
+        report = uv_helpers_arrays.get_report(obj.data.name) if self.use_report else None
+        arrays = uv_helpers_arrays.get_mesh_arrays(obj, report.uv_layer_name if report is not None else None)
+        if arrays.uvs is None:
+            self.report({"WARNING"}, "[LL-UV-Helper] Mesh '{}' has no UV map.".format(obj.data.name))
+            return {'CANCELLED'}
 
-        for face in bmesh.faces:
-            for loop in face.loops:
-                luv = loop[uv_layer]
-                if (luv.select or sync) and loop.vert.select:
-                    print(loop.index)
-                    uvs[loop.index] = luv
-                    #uvs.append(luv)
-    return uvs
+        preferences = leader.get_preferences(context)
+        triangulation = "FAN"
+        if preferences is not None:
+            triangulation = preferences.uvhelpers_errorchecker_triangulation
+
+        image = image_helpers_raster.render_uv_layout(arrays, self.size, self.size, self.fill_color, self.wire_color,
+            self.error_color, report.uvs if report is not None else None, triangulation)
+        filepath = image_helpers_png.write_png(bpy.path.abspath(self.filepath), image)
+        self.report({"INFO"}, "[LL-UV-Helper] Saved UV overlay to '{}'.".format(filepath))
+        return {'FINISHED'}
 
-last_selected_uvs = []
-last_selection = None
+def draw_vertex_estimate(layout, context):
+    obj = context.object
+    if obj is None or obj.type != "MESH" or obj.data is None:
+        return
+    estimate = uv_helpers_splits.get_estimate(obj.data.name)
+    if estimate is None:
+        return
+
+    col = layout.box().column(align=True)
+    ratio = estimate.total / estimate.total_verts if estimate.total_verts > 0 else 0
+    col.label("Export Vertices: {} ({:.2f}x of {})".format(estimate.total, ratio, estimate.total_verts))
+    for name, count in estimate.layer_totals.items():
+        col.label("  {}: {}".format(name, count))
+    col.label("Most Splits: {}".format(estimate.max_splits))
+
+def draw_islands(layout, context):
+    layout.label("UV Islands")
+    box = layout.box()
+    box.operator(LLUVHelpers_IslandsBuildOperator.bl_idname)
+
+    islands = get_active_islands(context)
+    if islands is None:
+        return
+
+    settings = context.object.data.llhelpers_uvreport
+    box.label("{} islands, UV area {:.4f}".format(len(islands), islands.island_uv_areas.sum()))
+    if len(islands) == 0:
+        return
+
+    row = box.row(align=True)
+    row.prop(settings, "island_index")
+    row.operator(LLUVHelpers_IslandsSelectOperator.bl_idname, text="", icon="RESTRICT_SELECT_OFF")
+
+    index = settings.island_index
+    if index < len(islands):
+        col = box.column(align=True)
+        col.label("Faces: {}".format(islands.island_counts[index]))
+        col.label("UV Area: {:.6f}".format(islands.island_uv_areas[index]))
+        col.label("3D Area: {:.6f}".format(islands.island_areas[index]))
+        col.label("UV Bounds: ({:.3f}, {:.3f}) - ({:.3f}, {:.3f})".format(
+            islands.island_uv_min[index][0], islands.island_uv_min[index][1],
+            islands.island_uv_max[index][0], islands.island_uv_max[index][1]))
+
+def selectedUVs(obj, uv_layer_name=None, sync=False):
+    '''Get the loops visible and selected in the UV view.
+
+    Returns (loop indices, UVs), with each distinct UV position listed once, in loop order.
+    '''
+    arrays = uv_helpers_arrays.get_mesh_arrays(obj, uv_layer_name)
+    if arrays.uvs is None:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 2), dtype=np.float32)
+    loops = uv_helpers_arrays.selected_uv_loops(arrays, sync)
+    uvs = arrays.uvs[loops]
+    if len(loops) > 1:
+        groups, total = uv_helpers_arrays.unique_rows(uv_helpers_arrays.float_bits(uvs).astype(np.int64))
+        first = np.full(total, len(loops), dtype=np.int64)
+        np.minimum.at(first, groups, np.arange(len(loops)))
+        first.sort()
+        loops = loops[first]
+        uvs = uvs[first]
+    return loops, uvs
+
+class LLUVHelpers_CursorRing:
+    '''The selected UVs the cursor steps through, keyed by a hash of the selection.'''
+    def __init__(self, key, uvs):
+        self.key = key
+        self.uvs = uvs
+        self.index = -1
+
+    def next(self):
+        self.index = (self.index + 1) % len(self.uvs)
+        return self.uvs[self.index]
+
+cursor_ring = None
+
+def selection_hash(mesh_name, loops, uvs):
+    data = hashlib.md5(mesh_name.encode("utf-8"))
+    data.update(loops.tobytes())
+    data.update(uvs.tobytes())
+    return data.hexdigest()
 
 class LLUVHelpers_SelectCursorOperator(Operator):
     """Move the cursor to the last selected UV"""      # Use this as a tooltip for menu items and buttons.
@@ -219,58 +777,38 @@ class LLUVHelpers_SelectCursorOperator(Operator):
         return (context.mode == 'EDIT_MESH')
 
     def execute(self, context):        # execute() is called when running the operator.
+        global cursor_ring
+
+        node = context.scene.objects.active
 
-        print("Looking for selected UVs...")
-
-        node = bpy.context.scene.objects.active
-
-        if node.type == "MESH":
-            if (node.data is not None):
-
-                mesh = node.data
-                bm = bmesh.from_edit_mesh(mesh)
-
-                selected = selectedUVs(mesh=mesh, bmesh=bm, sync=context.scene.tool_settings.use_uv_select_sync)
-                total = len(selected)
-                if len(selected) > 0:
-
-                    global last_selected_uvs
-                    global last_selection
-
-                    selection = 0
-                    for key in selected.keys():
-                        selection += key
-                    
-                    if selection == last_selection:
-                        last_total = len(last_selected_uvs)
-                        if last_total == total:
-                            last = last_selected_uvs[-1]
-                            last_selected_uvs.clear()
-                            last_selected_uvs.append(last)
-                    else:
-                        last_selected_uvs.clear()
-
-                    for i, uvdata in selected.items():
-                        if not i in last_selected_uvs:
-                            bpy.ops.uv.cursor_set(location=uvdata.uv)
-                            last_selected_uvs.append(i)
-                            break
-
-                    last_selection = selection
-                
-                # uv_layer = bm.loops.layers.uv.active
-                # for f in bm.faces:
-                #     for l in f.loops:
-                #         luv = l[uv_layer]
-                #         if luv.select:
-                #             bpy.ops.uv.cursor_set(location=luv.uv)
-                #             print(luv.uv)
-                #             break
+        if node is not None and node.type == "MESH" and node.data is not None:
+            loops, uvs = selectedUVs(node, sync=context.scene.tool_settings.use_uv_select_sync)
+            if len(loops) > 0:
+                # Pressing again with the same selection steps to the next UV
+                key = selection_hash(node.data.name, loops, uvs)
+                if cursor_ring is None or cursor_ring.key != key:
+                    cursor_ring = LLUVHelpers_CursorRing(key, uvs)
+                bpy.ops.uv.cursor_set(location=tuple(cursor_ring.next()))
 
         return {'FINISHED'}            # Lets Blender know the operator finished successfully.
 
+def select_flagged_edges(operator, context, flag):
+    '''Add every edge with the given flag (a MeshArrays edge property) to the selection.'''
+    node = context.scene.objects.active
+    if node is None or node.type != "MESH" or node.data is None:
+        operator.report({"WARNING"}, "[LL-UV-Helper] Select a mesh first!")
+        return {'FINISHED'}
+
+    arrays = uv_helpers_arrays.get_mesh_arrays(node)
+    edges = np.flatnonzero(getattr(arrays, flag))
+    vertex_mode = tuple(context.tool_settings.mesh_select_mode) == (True, False, False)
+    if len(edges) > 0:
+        uv_helpers_arrays.select_edges(node, arrays, edges, vertex_mode)
+    operator.report({"INFO"}, "[LL-UV-Helper] Selected {} edges.".format(len(edges)))
+    return {'FINISHED'}
+
 class LLUVHelpers_SelectSharpOperator(Operator):
-    """Selects all seams"""
+    """Selects all sharp edges"""
     bl_idname = "uv.llhelpers_sharpselecter"
     bl_label = "Select Sharps Edges"
     bl_options = {'REGISTER', 'UNDO'}
@@ -280,29 +818,53 @@ class LLUVHelpers_SelectSharpOperator(Operator):
         return (context.mode == 'EDIT_MESH')
 
     def execute(self, context):
-        scene = context.scene
+        return select_flagged_edges(self, context, "edge_sharp")
 
-        if context.object is None:
-            self.report({"WARNING"}, "[LL-UV-Helper] No object selected!")
-            return {'FINISHED'}
+class LLUVHelpers_SharpByAngleOperator(Operator):
+    """Mark or select every edge whose faces meet at more than the given angle"""
+    bl_idname = "uv.llhelpers_sharpbyangle"
+    bl_label = "Sharp Edges by Angle"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        node = bpy.context.scene.objects.active
+    angle = FloatProperty(name="Angle", description="Edges whose faces meet at more than this angle are sharp", default=math.radians(30.0), min=0.0, max=math.pi, subtype="ANGLE")
+    action = EnumProperty(name="Action", items=(
+        ("MARK", "Mark Sharp", "Mark the edges as sharp"),
+        ("SELECT", "Select", "Add the edges to the selection")),
+        default="MARK"
+    )
+    seams_only = BoolProperty(name="Seams Only", description="Only affect edges that are UV seams", default=False)
+    clear_sharp = BoolProperty(name="Clear Sharp", description="When marking, clear sharp edges below the angle", default=False)
 
-        bpy.ops.object.mode_set(mode="EDIT")
-        if node.type == "MESH":
-            if (node.data is not None):
-                mesh = node.data
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH')
 
-                bm = bmesh.from_edit_mesh(mesh)
-                for edge in bm.edges:
-                    if edge.smooth == False:
-                        if bm.select_mode == "VERT":
-                            for v in edge.verts:
-                                v.select = True
-                        else:
-                            edge.select = True
-                bmesh.update_edit_mesh(mesh)
+    def execute(self, context):
+        node = context.scene.objects.active
+        if node is None or node.type != "MESH" or node.data is None:
+            self.report({"WARNING"}, "[LL-UV-Helper] Select a mesh first!")
+            return {'FINISHED'}
 
+        arrays = uv_helpers_arrays.get_mesh_arrays(node)
+        sharp = uv_helpers_arrays.edge_dihedral_angles(arrays) > self.angle
+        if self.seams_only:
+            sharp &= arrays.edge_seams
+        total = int(sharp.sum())
+
+        if self.action == "MARK":
+            if self.clear_sharp:
+                # Keep sharp edges outside the affected set (non-seams) when limited to seams
+                keep = arrays.edge_sharp & ~arrays.edge_seams if self.seams_only else np.zeros_like(sharp)
+                sharp |= keep
+            else:
+                sharp |= arrays.edge_sharp
+            uv_helpers_arrays.write_edge_flags(node, "use_edge_sharp", sharp)
+            self.report({"INFO"}, "[LL-UV-Helper] Marked {} sharp edges on '{}'.".format(total, node.name))
+        else:
+            vertex_mode = tuple(context.tool_settings.mesh_select_mode) == (True, False, False)
+            if total > 0:
+                uv_helpers_arrays.select_edges(node, arrays, np.flatnonzero(sharp), vertex_mode)
+            self.report({"INFO"}, "[LL-UV-Helper] Selected {} edges.".format(total))
         return {'FINISHED'}
 
 class LLUVHelpers_SelectSeamOperator(Operator):
@@ -316,32 +878,36 @@ class LLUVHelpers_SelectSeamOperator(Operator):
         return (context.mode == 'EDIT_MESH')
 
     def execute(self, context):
-        scene = context.scene
+        return select_flagged_edges(self, context, "edge_seams")
 
-        if bpy.context.scene.objects.active is None:
-            self.report({"WARNING"}, "[LL-UV-Helper] Select a mesh before selecting seams!")
-            return {'FINISHED'}
+class LLUVHelpers_SeamsFromIslandsOperator(Operator):
+    """Mark seams on every UV island boundary"""
+    bl_idname = "uv.llhelpers_seamsfromislands"
+    bl_label = "Seams from UV Islands"
+    bl_options = {'REGISTER', 'UNDO'}
 
-        node = bpy.context.scene.objects.active
+    clear_seams = BoolProperty(name="Clear Seams", description="Clear existing seams that aren't on an island boundary", default=True)
 
-        bpy.ops.object.mode_set(mode="EDIT")
-        if node.type == "MESH":
-            if (node.data is not None):
-                mesh = node.data
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH')
 
-                bm = bmesh.from_edit_mesh(mesh)
-                for edge in bm.edges:
-                    #edge.select_set(False)
-                    if edge.seam:
-                        if bm.select_mode == "VERT":
-                            for v in edge.verts:
-                                v.select = True
-                        else:
-                            edge.select = True
+    def execute(self, context):
+        node = context.scene.objects.active
+        if node is None or node.type != "MESH" or node.data is None:
+            self.report({"WARNING"}, "[LL-UV-Helper] Select a mesh first!")
+            return {'FINISHED'}
 
-                #bm.select_flush(False)
-                bmesh.update_edit_mesh(mesh)
+        arrays = uv_helpers_arrays.get_mesh_arrays(node)
+        if arrays.uvs is None:
+            self.report({"WARNING"}, "[LL-UV-Helper] '{}' has no UV map.".format(node.name))
+            return {'FINISHED'}
 
+        seams = uv_helpers_islands.uv_split_edges(arrays)
+        if not self.clear_seams:
+            seams |= arrays.edge_seams
+        uv_helpers_arrays.write_edge_flags(node, "use_seam", seams)
+        self.report({"INFO"}, "[LL-UV-Helper] Marked {} seams on '{}'.".format(int(seams.sum()), node.name))
         return {'FINISHED'}
 
 class LEADER_PT_imageeditor_tools_uv_helpers(Panel):
@@ -368,13 +934,45 @@ class LEADER_PT_imageeditor_tools_uv_helpers(Panel):
             box.label(length_check_value_str)
             box.prop(preferences, "uvhelpers_errorchecker_select_all")
             box.prop(preferences, "uvhelpers_errorchecker_select_mode")
+            box.prop(preferences, "uvhelpers_errorchecker_triangulation")
+            box.prop(preferences, "uvhelpers_errorchecker_all_selected")
+            box.prop(preferences, "uvhelpers_errorchecker_incremental")
+            box.prop(preferences, "uvhelpers_errorchecker_print_errors")
+            box.prop(preferences, "uvhelpers_errorchecker_sanity")
         uv_helper_op = box.operator(LLUVHelpers_BadTriangleCheckerOperator.bl_idname)
         uv_helper_op.length_check_value = length_check_value
+        if preferences is not None:
+            box.prop(preferences, "uvhelpers_errorchecker_uv_range")
+            box.prop(preferences, "uvhelpers_errorchecker_all_layers")
+        box.operator(LLUVHelpers_UVSanityCheckerOperator.bl_idname)
+        draw_uv_sanity(box, context)
+        box.operator(LLUVHelpers_OverlapCheckerOperator.bl_idname)
+        if preferences is not None:
+            box.prop(preferences, "uvhelpers_errorchecker_tangent_angle")
+        box.operator(LLUVHelpers_TangentCheckerOperator.bl_idname)
+        if preferences is not None:
+            box.prop(preferences, "uvhelpers_errorchecker_texel_resolution")
+            box.prop(preferences, "uvhelpers_errorchecker_texel_density")
+            box.prop(preferences, "uvhelpers_errorchecker_texel_tolerance")
+            box.prop(preferences, "uvhelpers_errorchecker_texel_islands")
+        box.operator(LLUVHelpers_TexelDensityCheckerOperator.bl_idname)
+        draw_texel_density(box, context)
+
+        draw_error_report(layout, context)
+
+        layout.label("Export")
+        layout.operator(LLUVHelpers_VertexEstimateOperator.bl_idname)
+        layout.operator(LLUVHelpers_ExportLayoutOperator.bl_idname)
+        draw_vertex_estimate(layout, context)
+
+        draw_islands(layout, context)
 
         layout.label("Misc")
         layout.operator(LLUVHelpers_SelectCursorOperator.bl_idname)
         layout.operator(LLUVHelpers_SelectSeamOperator.bl_idname)
+        layout.operator(LLUVHelpers_SeamsFromIslandsOperator.bl_idname)
         layout.operator(LLUVHelpers_SelectSharpOperator.bl_idname)
+        layout.operator(LLUVHelpers_SharpByAngleOperator.bl_idname)
 
 class LLUVHelpers_DeleteOperator(Operator):
     """Delete this image data"""
@@ -400,8 +998,11 @@ class LLUVHelpers_DeleteOperator(Operator):
                 index = bpy.data.images.find(image_name)
                 if index > -1:
                     image = bpy.data.images[index]
+                    users = image_helpers_users.get_image_usage(context.blend_data).get_users(image_name)
                     bpy.data.images.remove(image)
                     msg = "[LeaderHelpers:UVHelpers:Delete] Deleted image '{}'. Undo to reverse.".format(image_name)
+                    if users is not None and users.total > 0:
+                        msg += " It was used by {} materials, {} textures and {} objects.".format(len(users.materials), len(users.textures), len(users.objects))
                     context.scene.update()
             except Exception as e:
                 msg = "[LeaderHelpers:UVHelpers:Delete] Error deleting image:\n\t{}".format(e)
@@ -416,31 +1017,312 @@ class LLUVHelpers_DeleteOperator(Operator):
 
     def invoke(self, context, _event):
         return self.execute(context)
+image_scopes = (
+    ("ALL", "All Images", "Every image in the file"),
+    ("VISIBLE", "Visible Objects", "Images used by the materials of visible objects"),
+    ("SELECTED", "Selected Objects", "Images used by the materials of selected objects"),
+)
+
+def get_scoped_image_names(context, scope):
+    '''Names of the images in the scope, or None for every image.'''
+    if scope == "VISIBLE":
+        objects = [obj.name for obj in context.scene.objects if leader.is_visible(context.scene, obj)]
+    elif scope == "SELECTED":
+        objects = [obj.name for obj in context.selected_objects]
+    else:
+        return None
+    return image_helpers_users.get_image_usage(context.blend_data).images_used_by(objects)
+
+def get_file_images(context, names=None):
+    '''(name, absolute path) of every image that's loaded from a file, optionally only the named ones.'''
+    images = []
+    for image in context.blend_data.images:
+        if names is not None and image.name not in names:
+            continue
+        if image.source in {"FILE", "SEQUENCE", "MOVIE"} and image.filepath != "" and image.packed_file is None:
+            images.append((image.name, bpy.path.abspath(image.filepath, library=image.library)))
+    return images
+
+def reload_images(context, names):
+    '''Reload the named images, redrawing image editors if any were reloaded.'''
+    reloaded = 0
+    for name in names:
+        image = context.blend_data.images.get(name)
+        if image is not None:
+            image.reload()
+            reloaded += 1
+    if reloaded > 0 and context.screen is not None:
+        for area in context.screen.areas:
+            if area.type in ['IMAGE_EDITOR', 'VIEW_3D']:
+                area.tag_redraw()
+    return reloaded
+
 class LLUVHelpers_ImageReloaderOperator(Operator):
-    """Reloads all images from their source"""
+    """Reloads all images whose files changed on disk"""
     bl_idname = "image.llhelpers_reloadimages"
     bl_label = "Reload All Images"
     bl_options = {'REGISTER', 'UNDO'}
 
+    force = BoolProperty(name="Force", description="Reload every image, even if its file didn't change", default=False)
+    scope = EnumProperty(name="Images", description="Which images to reload", items=image_scopes, default="ALL")
+
     def execute(self, context):
-        updated_image = False
-        for image in context.blend_data.images:
-            if image.filepath != "":
-                path_check = bpy.path.abspath(image.filepath, library=image.library)
-                if os.path.exists(path_check):
-                    image.reload()
-                    print("[LL-UV-Helper] Reloaded image: \"{}\"".format(path_check))
-                    updated_image = True
-                else:
-                    print("[LL-UV-Helper] Skipped reloading image (file does not exist): \"{}\"".format(path_check))
+        images = get_file_images(context, get_scoped_image_names(context, self.scope))
+        stats = image_helpers_index.stat_files([path for name, path in images])
+        index = image_helpers_index.image_index
+        if self.force:
+            index.clear()
+        changed, missing, unchanged = index.compare(images, stats)
+
+        reload_images(context, [name for name, path in changed])
+        for name, path in changed:
+            index.update(name, path, stats[path])
+            print("[LL-UV-Helper] Reloaded image: \"{}\"".format(path))
+        for name, path in missing:
+            print("[LL-UV-Helper] Skipped reloading image (file does not exist): \"{}\"".format(path))
+
+        self.report({"INFO"}, "[LL-UV-Helper] Reloaded {} images ({} unchanged, {} missing).".format(len(changed), len(unchanged), len(missing)))
+        return {'FINISHED'}            # Lets Blender know the operator finished successfully.
 
-        if updated_image:
-            for area in bpy.context.screen.areas:
-                if area.type in ['IMAGE_EDITOR']:
-                    area.tag_redraw()
 
-        return {'FINISHED'}            # Lets Blender know the operator finished successfully.
+def estimate_image_bytes(img):
+    '''Memory used by a loaded image buffer (0 for images that aren't loaded).'''
+    if not img.has_data:
+        return 0
+    width, height = img.size
+    return image_helpers_memory.buffer_bytes(width, height, img.channels, img.is_float)
+
+class LLUVHelpers_ImageDuplicatesOperator(Operator):
+    """Find images with identical content and remap their users to a single image"""
+    bl_idname = "image.llhelpers_mergeduplicates"
+    bl_label = "Merge Duplicate Images"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    dry_run = BoolProperty(name="Dry Run", description="Only report the duplicates and the memory merging them would free", default=True)
+    remove = BoolProperty(name="Remove Duplicates", description="Delete the duplicate images after their users are remapped", default=True)
+
+    def execute(self, context):
+        sources = []
+        keys = {}
+        sizes = {}
+        skipped = []
+        for img in context.blend_data.images:
+            if img.type != "IMAGE":
+                continue
+            if img.is_dirty:
+                # Unsaved pixels no longer match the file or settings, and reading them in 2.79
+                # means one Python float per channel
+                skipped.append(img.name)
+                continue
+            if img.packed_file is not None:
+                data = img.packed_file.data
+                if isinstance(data, str):
+                    data = data.encode("utf-8", "surrogateescape")
+                sources.append((img.name, "DATA", data))
+            elif img.source == "GENERATED":
+                sources.append((img.name, "DATA", image_helpers_duplicates.generated_image_key(img.generated_type,
+                    img.generated_width, img.generated_height, img.generated_color, img.use_generated_float)))
+            elif img.source == "FILE" and img.filepath != "":
+                sources.append((img.name, "FILE", bpy.path.abspath(img.filepath, library=img.library)))
+            else:
+                continue
+            # The same file used as color and as data (e.g. normal maps) isn't a duplicate
+            keys[img.name] = img.colorspace_settings.name
+            sizes[img.name] = estimate_image_bytes(img)
+
+        hashes = image_helpers_duplicates.hash_sources(sources)
+        groups = image_helpers_duplicates.group_duplicates(hashes, keys, sizes)
+        total_duplicates = sum(len(group.duplicates) for group in groups)
+        reclaimable = image_helpers_duplicates.format_bytes(sum(group.reclaimable_bytes for group in groups))
+        for group in groups:
+            print("[LL-UV-Helper] Duplicate images of '{}': {} ({} loaded)".format(group.canonical, ", ".join(group.duplicates),
+                image_helpers_duplicates.format_bytes(group.reclaimable_bytes)))
+        if len(skipped) > 0:
+            print("[LL-UV-Helper] Skipped images with unsaved changes: {}".format(", ".join(skipped)))
+
+        if total_duplicates == 0:
+            self.report({"INFO"}, "[LL-UV-Helper] No duplicate images found.")
+            return {'FINISHED'}
+
+        if self.dry_run:
+            self.report({"INFO"}, "[LL-UV-Helper] Found {} duplicate images in {} groups. Merging would free {} of loaded images. Disable Dry Run to merge.".format(
+                total_duplicates, len(groups), reclaimable))
+            return {'FINISHED'}
+
+        images = context.blend_data.images
+        for group in groups:
+            canonical = images[group.canonical]
+            for name in group.duplicates:
+                duplicate = images[name]
+                duplicate.user_remap(canonical)
+                if self.remove:
+                    images.remove(duplicate)
+        self.report({"INFO"}, "[LL-UV-Helper] Merged {} duplicate images into {} images, freeing {}.".format(total_duplicates, len(groups), reclaimable))
+        return {'FINISHED'}
+
+def build_image_memory_report(context):
+    '''Memory use of every file or generated image. Images used by visible objects or shown in an image editor count as visible.'''
+    visible = get_scoped_image_names(context, "VISIBLE")
+    if context.screen is not None:
+        for area in context.screen.areas:
+            if area.type == "IMAGE_EDITOR" and area.spaces.active.image is not None:
+                visible.add(area.spaces.active.image.name)
+
+    entries = []
+    for img in context.blend_data.images:
+        # Render results and viewer nodes hold output that freeing would throw away
+        if img.type != "IMAGE":
+            continue
+        packed_size = img.packed_file.size if img.packed_file is not None else 0
+        if img.has_data:
+            width, height = img.size
+            entry = image_helpers_memory.LLUVHelpers_ImageMemoryEntry(img.name, True, width, height, img.channels, img.is_float,
+                packed_size, img.users, img.name in visible, img.is_dirty)
+        else:
+            entry = image_helpers_memory.LLUVHelpers_ImageMemoryEntry(img.name, False, packed_size=packed_size, users=img.users,
+                visible=img.name in visible, dirty=img.is_dirty)
+        entries.append(entry)
+    report = image_helpers_memory.LLUVHelpers_ImageMemoryReport(entries)
+    image_helpers_memory.set_report(report)
+    return report
+
+class LLUVHelpers_ImageMemoryReportOperator(Operator):
+    """List the memory used by every image, largest first"""
+    bl_idname = "image.llhelpers_imagememoryreport"
+    bl_label = "Image Memory Report"
+
+    def execute(self, context):
+        report = build_image_memory_report(context)
+        for entry in report.entries:
+            print("[LL-UV-Helper] {}: {} | {} | {} users{}".format(entry.name, image_helpers_duplicates.format_bytes(entry.memory),
+                entry.describe(), entry.users, "" if entry.visible else " (not visible)"))
+        self.report({"INFO"}, "[LL-UV-Helper] Images: {}".format(report.summary()))
+        return {'FINISHED'}
+
+class LLUVHelpers_FreeImageBuffersOperator(Operator):
+    """Free the pixel buffers of loaded images that nothing visible uses.\nImages with unsaved changes are kept, freed images load again when they're needed"""
+    bl_idname = "image.llhelpers_freeimagebuffers"
+    bl_label = "Free Unused Image Buffers"
+
+    def execute(self, context):
+        report = build_image_memory_report(context)
+        freeable = report.freeable
+        freed = report.freeable_memory
+        for entry in freeable:
+            img = context.blend_data.images.get(entry.name)
+            if img is not None and img.type == "IMAGE":
+                img.gl_free()
+                img.buffers_free()
+        build_image_memory_report(context)
+        self.report({"INFO"}, "[LL-UV-Helper] Freed {} from {} images.".format(image_helpers_duplicates.format_bytes(freed), len(freeable)))
+        return {'FINISHED'}
+
+def draw_image_memory(layout, context, limit=10):
+    row = layout.row(align=True)
+    row.operator(LLUVHelpers_ImageMemoryReportOperator.bl_idname, icon="FILE_REFRESH")
+    row.operator(LLUVHelpers_FreeImageBuffersOperator.bl_idname, text="", icon="X")
+    report = image_helpers_memory.get_report()
+    if report is None:
+        return
+    col = layout.column(align=True)
+    col.label(report.summary())
+    for entry in report.entries[:limit]:
+        col.label("{}: {} ({})".format(entry.name, image_helpers_duplicates.format_bytes(entry.memory), entry.describe()),
+            icon="RESTRICT_VIEW_OFF" if entry.visible else "RESTRICT_VIEW_ON")
+
+image_watcher = None
+
+class LLUVHelpers_ImageWatcherOperator(Operator):
+    """Watch image files and reload them when they change on disk"""
+    bl_idname = "image.llhelpers_watchimages"
+    bl_label = "Watch Image Files"
+
+    _timer = None
+
+    def invoke(self, context, event):
+        global image_watcher
+        if image_watcher is not None:
+            # Pressing the button again stops the running watcher
+            image_watcher = None
+            return {'FINISHED'}
 
+        preferences = leader.get_preferences(context)
+        interval = 1.0
+        debounce = 0.5
+        workers = 4
+        if preferences is not None:
+            interval = preferences.uvhelpers_images_watch_interval
+            debounce = preferences.uvhelpers_images_watch_debounce
+            workers = preferences.uvhelpers_images_watch_workers
+
+        image_watcher = image_helpers_index.LLUVHelpers_ImageWatcher(image_helpers_index.image_index, debounce, workers)
+        self._watcher = image_watcher
+        self._interval = interval
+        self._next_poll = 0.0
+        self._timer = context.window_manager.event_timer_add(interval, context.window)
+        context.window_manager.modal_handler_add(self)
+        self.report({"INFO"}, "[LL-UV-Helper] Watching image files for changes.")
+        return {'RUNNING_MODAL'}
+
+    def stop(self, context):
+        context.window_manager.event_timer_remove(self._timer)
+        self._watcher.shutdown()
+
+    def modal(self, context, event):
+        if image_watcher is not self._watcher:
+            self.stop(context)
+            self.report({"INFO"}, "[LL-UV-Helper] Stopped watching image files.")
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER':
+            polls = self._watcher.total_polls
+            ready = self._watcher.collect(time.time())
+            if len(ready) > 0:
+                reload_images(context, [name for name, path, stat in ready])
+                for name, path, stat in ready:
+                    self._watcher.index.update(name, path, stat)
+                    print("[LL-UV-Helper] Reloaded changed image: \"{}\"".format(path))
+                self._watcher.total_reloads += len(ready)
+            if self._watcher.total_polls != polls:
+                # Keep the stats in the Image Helpers panel current
+                tag_image_editors(context)
+            # Other timers also send TIMER events, so keep to the poll interval
+            now = time.time()
+            if not self._watcher.busy and now >= self._next_poll:
+                self._next_poll = now + self._interval * 0.9
+                self._watcher.start_poll(get_file_images(context))
+        return {'PASS_THROUGH'}
+
+def draw_image_users(layout, context):
+    img = getattr(context.space_data, "image", None)
+    if img is None:
+        return
+    users = image_helpers_users.get_image_usage(context.blend_data).get_users(img.name)
+    if users is None:
+        layout.label("Not used by any material", icon="INFO")
+    else:
+        layout.label("Used by {} materials, {} objects".format(len(users.materials), len(users.objects)), icon="INFO")
+
+def draw_image_watcher(layout, context):
+    watcher = image_watcher
+    if watcher is None:
+        layout.operator(LLUVHelpers_ImageWatcherOperator.bl_idname, icon="PLAY")
+        return
+
+    layout.operator(LLUVHelpers_ImageWatcherOperator.bl_idname, text="Stop Watching", icon="PAUSE")
+    col = layout.column(align=True)
+    col.label("Watching {} images ({} reloaded)".format(watcher.total_images, watcher.total_reloads))
+    col.label("Last check: {:.1f} ms".format(watcher.last_poll_time * 1000.0))
+
+def save_image_render(img, filepath, scene):
+    '''Save an image as a PNG with save_render, leaving the scene's output format as it was.'''
+    image_settings = scene.render.image_settings
+    last_format = image_settings.file_format
+    image_settings.file_format = 'PNG'
+    try:
+        img.save_render(filepath, scene)
+    finally:
+        image_settings.file_format = last_format
 
 class LEADER_OT_image_helpers_quickexport(Operator):
     """Exports the current image quickly"""
@@ -464,13 +1346,8 @@ class LEADER_OT_image_helpers_quickexport(Operator):
                     img = getattr(context.space_data, "image", None)
                     if img != None:
                         if use_date:
-                            from datetime import datetime, timezone
-                            fp = os.path.splitext(filepath)[0]
-                            date =  datetime.fromtimestamp(datetime.now().timestamp()).strftime("%m-%d-%Y_%H-%M-%S")
-                            fp = "{}_{}.png".format(fp, date)
-                            filepath = fp
-                        context.scene.render.image_settings.file_format='PNG'
-                        img.save_render(filepath, context.scene)
+                            filepath = preferences.images_quickexport_resolve(context, image_helpers_template.format_date())
+                        save_image_render(img, filepath, context.scene)
                         #bpy.ops.image.save_as(filepath=filepath, save_as_render=False, copy=False)
                         self.report({"INFO"}, "[LeaderHelpers:ExportImage] Saved image to '{}'".format(filepath))
                 except Exception as e:
@@ -480,6 +1357,102 @@ class LEADER_OT_image_helpers_quickexport(Operator):
             else:
                 self.report({"WARNING"}, "[LL-UV-Helper:ExportImage] File path not set. Skipping")
                 return {'CANCELLED'}
+        return {'CANCELLED'}
+
+class LEADER_OT_image_helpers_batchexport(Operator):
+    """Export every image matching the filter as a PNG, using the quick export directory and naming settings"""
+    bl_idname = "image.llhelpers_batchexportoperator"
+    bl_label = "Export All Images"
+    bl_options = {'REGISTER'}
+
+    _timer = None
+
+    def execute(self, context):
+        preferences = leader.get_scene_preferences(context)
+        if preferences is None:
+            return {'CANCELLED'}
+
+        image_filter = preferences.uvhelpers_images_batchexport_filter
+        names = get_scoped_image_names(context, image_filter)
+        images = []
+        for img in context.blend_data.images:
+            if img.type == "IMAGE" and (names is None or img.name in names):
+                images.append((img.name, img.is_dirty, img.source == "GENERATED"))
+        self._queue = image_helpers_export.match_images(images, image_filter, preferences.uvhelpers_images_batchexport_pattern)
+        if len(self._queue) == 0:
+            self.report({"WARNING"}, "[LL-UV-Helper:ExportImage] No images to export.")
+            return {'CANCELLED'}
+
+        directory = bpy.path.abspath(preferences.images_quickexport_get_directory())
+        date = image_helpers_template.format_date() if preferences.uvhelpers_images_quickexport_appenddate else ""
+        # Everything but the image name is the same for every file, so it's only gathered once
+        template = preferences.images_quickexport_get_template()
+        values = preferences.images_quickexport_get_values(context, date, "")
+        self._filepaths = {}
+        used = set()
+        for name in self._queue:
+            values["name"] = image_helpers_export.image_base_name(name)
+            filepath = bpy.path.abspath(template.resolve(values))
+            # "tex.png" and "tex.jpg" both resolve to "tex", keep one from overwriting the other
+            base, ext = os.path.splitext(filepath)
+            index = 1
+            while os.path.normcase(filepath) in used:
+                filepath = "{}_{}{}".format(base, index, ext)
+                index += 1
+            used.add(os.path.normcase(filepath))
+            self._filepaths[name] = filepath
+
+        self._total = len(self._queue)
+        self._saved = 0
+        self._failed = []
+        self._start = time.time()
+        context.window_manager.progress_begin(0, self._total)
+        self._timer = context.window_manager.event_timer_add(0.1, context.window)
+        context.window_manager.modal_handler_add(self)
+        self.report({"INFO"}, "[LeaderHelpers:ExportImage] Exporting {} images to '{}'".format(len(self._queue), directory))
+        return {'RUNNING_MODAL'}
+
+    def save_next(self, context):
+        '''Save the next image in the queue. One image per timer tick keeps the UI updating in between.'''
+        while len(self._queue) > 0:
+            name = self._queue.pop(0)
+            img = context.blend_data.images.get(name)
+            if img is None or img.size[0] == 0 or img.size[1] == 0:
+                print("[LL-UV-Helper:ExportImage] Skipped image without pixel data: '{}'.".format(name))
+                continue
+            filepath = self._filepaths[name]
+            try:
+                directory = os.path.dirname(filepath)
+                if directory != "" and not os.path.isdir(directory):
+                    os.makedirs(directory)
+                save_image_render(img, filepath, context.scene)
+                self._saved += 1
+            except Exception as e:
+                self._failed.append((name, e))
+            return
+
+    def modal(self, context, event):
+        if event.type == 'TIMER':
+            self.save_next(context)
+            context.window_manager.progress_update(self._total - len(self._queue))
+            if len(self._queue) == 0:
+                context.window_manager.event_timer_remove(self._timer)
+                context.window_manager.progress_end()
+                for name, error in self._failed:
+                    print("[LL-UV-Helper:ExportImage] Error occured when exporting image '{}': {}.".format(name, error))
+                total = self._saved + len(self._failed)
+                if len(self._failed) > 0:
+                    self.report({"ERROR"}, "[LL-UV-Helper:ExportImage] Failed to export {} of {} images.".format(len(self._failed), total))
+                else:
+                    self.report({"INFO"}, "[LeaderHelpers:ExportImage] Exported {} images ({:.2f}s)".format(total, time.time() - self._start))
+                return {'FINISHED'}
+        return {'PASS_THROUGH'}
+
+def tag_image_editors(context):
+    if context.screen is not None:
+        for area in context.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.tag_redraw()
 
 class LEADER_PT_imageeditor_tools_image_helpers(Panel):
     bl_label = "Image Helpers"
@@ -498,12 +1471,29 @@ class LEADER_PT_imageeditor_tools_image_helpers(Panel):
         preferences = leader.get_scene_preferences(context)
         layout = self.layout
 
-        layout.operator(LLUVHelpers_ImageReloaderOperator.bl_idname)
+        row = layout.row(align=True)
+        row.operator(LLUVHelpers_ImageReloaderOperator.bl_idname)
+        row.operator(LLUVHelpers_ImageReloaderOperator.bl_idname, text="", icon="RESTRICT_VIEW_OFF").scope = "VISIBLE"
+        draw_image_users(layout, context)
+        layout.operator(LLUVHelpers_ImageDuplicatesOperator.bl_idname)
+
+        layout.label("Memory", icon="MEMORY")
+        box = layout.box()
+        draw_image_memory(box, context)
+
+        preferences_addon = leader.get_preferences(context)
+        box = layout.box()
+        draw_image_watcher(box, context)
+        if preferences_addon is not None:
+            box.prop(preferences_addon, "uvhelpers_images_watch_interval")
+            box.prop(preferences_addon, "uvhelpers_images_watch_debounce")
+            box.prop(preferences_addon, "uvhelpers_images_watch_workers")
 
         layout.label("Export", icon="FILE_IMAGE")
         box = layout.box()
         if preferences is not None:
             box.prop(preferences, "uvhelpers_images_quickexport_directory")
+            box.prop(preferences, "uvhelpers_images_quickexport_template")
             box.prop(preferences, "uvhelpers_images_quickexport_autoname")
             box.prop(preferences, "uvhelpers_images_quickexport_manualname")
             box.prop(preferences, "uvhelpers_images_quickexport_append")
@@ -513,6 +1503,11 @@ class LEADER_PT_imageeditor_tools_image_helpers(Panel):
             export_path = bpy.path.basename(preferences.uvhelpers_images_quickexport_filepath)
             #box.label(export_path)
             op = box.operator(LEADER_OT_image_helpers_quickexport.bl_idname)
+            box.separator()
+            box.prop(preferences, "uvhelpers_images_batchexport_filter")
+            if preferences.uvhelpers_images_batchexport_filter == "PATTERN":
+                box.prop(preferences, "uvhelpers_images_batchexport_pattern")
+            box.operator(LEADER_OT_image_helpers_batchexport.bl_idname)
 
 # Draw Overrides
 
@@ -540,7 +1535,12 @@ def IMAGE_HT_header_draw(self, context):
 
     preferences = leader.get_preferences(context)
     if preferences is not None and preferences.general_enable_deletion:
-        layout.operator(LLUVHelpers_DeleteOperator.bl_idname, icon="CANCEL", text="", emboss=False)
+        users = image_helpers_users.image_usage.get_users(ima.name) if ima is not None and image_helpers_users.image_usage.built else None
+        if users is not None and len(users.objects) > 0:
+            # Used by objects, show how many so deleting isn't a surprise
+            layout.operator(LLUVHelpers_DeleteOperator.bl_idname, icon="CANCEL", text=str(len(users.objects)), emboss=False)
+        else:
+            layout.operator(LLUVHelpers_DeleteOperator.bl_idname, icon="CANCEL", text="", emboss=False)
 
     layout.prop(sima, "mode", text="")
 
@@ -601,13 +1601,33 @@ def draw_snap_addon(self, context):
 
 IMAGE_HT_header_draw_original = None
 
+@persistent
+def clear_uv_data_on_load(scene):
+    global cursor_ring, image_watcher
+    uv_helpers_arrays.clear_cache_on_load(scene)
+    uv_helpers_splits.vertex_estimates.clear()
+    uv_helpers_density.texel_densities.clear()
+    uv_helpers_sanity.face_problems.clear()
+    image_helpers_index.image_index.clear()
+    image_helpers_users.image_usage.clear()
+    image_helpers_memory.set_report(None)
+    image_watcher = None
+    cursor_ring = None
+
 def register_keymaps():
     wm = bpy.context.window_manager
 
     km = wm.keyconfigs.default.keymaps.new('Image', space_type='IMAGE_EDITOR', region_type='WINDOW', modal=False)
     addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_BadTriangleCheckerOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_UVSanityCheckerOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_OverlapCheckerOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_TangentCheckerOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_TexelDensityCheckerOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_VertexEstimateOperator.bl_idname, type='NONE', value='PRESS')))
     addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_SelectSeamOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_SeamsFromIslandsOperator.bl_idname, type='NONE', value='PRESS')))
     addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_SelectSharpOperator.bl_idname, type='NONE', value='PRESS')))
+    addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_SharpByAngleOperator.bl_idname, type='NONE', value='PRESS')))
     addon_keymaps.append((km, km.keymap_items.new(LLUVHelpers_SelectCursorOperator.bl_idname, type='NONE', value='PRESS')))
 
     print("[LeaderHelpers:uv_helpers] Registered keybindings.")
@@ -627,6 +1647,8 @@ def register():
     IMAGE_HT_header_draw_original = bpy.types.IMAGE_HT_header.draw
     bpy.types.IMAGE_HT_header.draw = IMAGE_HT_header_draw
     bpy.types.IMAGE_MT_uvs_snap.append(draw_snap_addon)
+    bpy.app.handlers.load_post.append(clear_uv_data_on_load)
+    bpy.app.handlers.scene_update_post.append(image_helpers_users.refresh_image_usage)
     register_keymaps()
 
 def unregister():
@@ -635,8 +1657,10 @@ def unregister():
         if IMAGE_HT_header_draw_original is not None:
             bpy.types.IMAGE_HT_header.draw = IMAGE_HT_header_draw_original
             IMAGE_HT_header_draw_original = None
-
         bpy.types.IMAGE_MT_uvs_snap.remove(draw_snap_addon)
+        bpy.app.handlers.load_post.remove(clear_uv_data_on_load)
+        bpy.app.handlers.scene_update_post.remove(image_helpers_users.refresh_image_usage)
+        clear_uv_data_on_load(None)
         unregister_keymaps()
     except: pass
 
@@ -0,0 +1,525 @@
+import bpy
+import hashlib
+import numpy as np
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from bpy.app.handlers import persistent
+
+from . import uv_helpers_overlap
+from . import uv_helpers_islands
+
+# Bulk mesh data access for the UV helpers.
+# Everything here works on flat NumPy arrays pulled with foreach_get, so checks scale with
+# the C side of Blender instead of per-element Python loops.
+
+def sync_edit_mesh(obj):
+    '''Flush edit-mode changes into obj.data so foreach_get sees the current mesh.'''
+    if obj.mode == "EDIT":
+        obj.update_from_editmode()
+
+def get_uv_layer(mesh, name=None):
+    if name is not None and name != "":
+        return mesh.uv_layers.get(name)
+    return mesh.uv_layers.active
+
+class LLUVHelpers_MeshArrays:
+    '''Loop, polygon and UV data for a single mesh as flat arrays.'''
+    def __init__(self, mesh, uv_layer=None):
+        self.mesh_name = mesh.name
+        self.object_name = ""
+        self.matrix_world = None
+        self.total_verts = len(mesh.vertices)
+        self.total_edges = len(mesh.edges)
+        self.total_polys = len(mesh.polygons)
+        self.total_loops = len(mesh.loops)
+
+        self.loop_verts = np.empty(self.total_loops, dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", self.loop_verts)
+
+        self.loop_start = np.empty(self.total_polys, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", self.loop_start)
+        self.loop_total = np.empty(self.total_polys, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", self.loop_total)
+
+        self._mesh = mesh
+        self._cache = {}
+
+        self.uv_layer_name = ""
+        self.uvs = None
+        if uv_layer is not None:
+            self.uv_layer_name = uv_layer.name
+            uvs = np.empty(self.total_loops * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", uvs)
+            self.uvs = uvs.reshape(-1, 2)
+
+    @property
+    def loop_polys(self):
+        '''Index of the polygon that owns each loop.'''
+        return np.repeat(np.arange(self.total_polys, dtype=np.int32), self.loop_total)
+
+    def _get(self, collection_name, attr, dtype, size=1):
+        '''foreach_get on first access, cached afterwards. Call from the main thread first.'''
+        key = (collection_name, attr)
+        data = self._cache.get(key)
+        if data is None:
+            collection = getattr(self._mesh, collection_name)
+            data = np.empty(len(collection) * size, dtype=dtype)
+            collection.foreach_get(attr, data)
+            if size > 1:
+                data = data.reshape(-1, size)
+            self._cache[key] = data
+        return data
+
+    @property
+    def vert_coords(self):
+        return self._get("vertices", "co", np.float32, 3)
+
+    @property
+    def loop_edges(self):
+        return self._get("loops", "edge_index", np.int32)
+
+    @property
+    def edge_verts(self):
+        return self._get("edges", "vertices", np.int32, 2)
+
+    @property
+    def edge_seams(self):
+        return self._get("edges", "use_seam", bool)
+
+    @property
+    def edge_sharp(self):
+        return self._get("edges", "use_edge_sharp", bool)
+
+    @property
+    def vert_select(self):
+        return self._get("vertices", "select", bool)
+
+    @property
+    def edge_select(self):
+        return self._get("edges", "select", bool)
+
+    @property
+    def poly_select(self):
+        return self._get("polygons", "select", bool)
+
+    @property
+    def uv_select(self):
+        '''UV selection of every loop, on this arrays' UV layer.'''
+        data = self._cache.get("uv_select")
+        if data is None:
+            data = np.zeros(self.total_loops, dtype=bool)
+            uv_layer = get_uv_layer(self._mesh, self.uv_layer_name)
+            if uv_layer is not None:
+                uv_layer.data.foreach_get("select", data)
+            self._cache["uv_select"] = data
+        return data
+
+    @property
+    def poly_normals(self):
+        return self._get("polygons", "normal", np.float32, 3)
+
+    @property
+    def poly_areas(self):
+        return self._get("polygons", "area", np.float32)
+
+    @property
+    def loop_normals(self):
+        '''Split (custom) normals of every loop.'''
+        if ("loops", "normal") not in self._cache:
+            self._mesh.calc_normals_split()
+        return self._get("loops", "normal", np.float32, 3)
+
+    @property
+    def all_uvs(self):
+        '''UVs of every UV layer, as an OrderedDict of layer name -> (n, 2) array.'''
+        data = self._cache.get("all_uvs")
+        if data is None:
+            data = OrderedDict()
+            for uv_layer in self._mesh.uv_layers:
+                uvs = np.empty(self.total_loops * 2, dtype=np.float32)
+                uv_layer.data.foreach_get("uv", uvs)
+                data[uv_layer.name] = uvs.reshape(-1, 2)
+            self._cache["all_uvs"] = data
+        return data
+
+    @property
+    def next_loops(self):
+        '''Index of the next loop around the same polygon.'''
+        next_loops = np.arange(1, self.total_loops + 1, dtype=np.int32)
+        last = self.loop_start + self.loop_total - 1
+        next_loops[last] = self.loop_start
+        return next_loops
+
+def float_bits(values):
+    '''Reinterpret float32 data as integers, so exact comparisons/sorting can use integer keys.'''
+    return np.ascontiguousarray(values, dtype=np.float32).view(np.uint32)
+
+def unique_rows(keys):
+    '''Group id for every row of a 2D integer array, and the total number of unique rows.'''
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64), 0
+    order = np.lexsort(keys.T[::-1])
+    sorted_keys = keys[order]
+    new_group = np.concatenate(([True], np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)))
+    groups = np.empty(len(keys), dtype=np.int64)
+    groups[order] = np.cumsum(new_group) - 1
+    return groups, int(new_group.sum())
+
+def get_mesh_arrays(obj, uv_layer_name=None):
+    sync_edit_mesh(obj)
+    mesh = obj.data
+    arrays = LLUVHelpers_MeshArrays(mesh, get_uv_layer(mesh, uv_layer_name))
+    arrays.object_name = obj.name
+    arrays.matrix_world = np.array(obj.matrix_world, dtype=np.float64)
+    return arrays
+
+def triangle_uv_cross(uvs, tris):
+    '''Twice the signed UV area of each triangle, where tris is an (n, 3) array of loop indices.'''
+    uv1 = uvs[tris[:, 0]].astype(np.float64)
+    uv2 = uvs[tris[:, 1]].astype(np.float64)
+    uv3 = uvs[tris[:, 2]].astype(np.float64)
+    s1 = uv2[:, 0] - uv1[:, 0]
+    s2 = uv3[:, 0] - uv1[:, 0]
+    t1 = uv2[:, 1] - uv1[:, 1]
+    t2 = uv3[:, 1] - uv1[:, 1]
+    return s1 * t2 - s2 * t1
+
+triangulation_methods = (
+        ("FAN", "Fan", "Split every polygon into a fan from its first corner (Blender's 'Fixed' quad method)"),
+        ("SHORTEST_DIAGONAL", "Shortest Diagonal", "Split quads along their shortest diagonal, n-gons as a fan"),
+)
+
+def triangulate(arrays, method="FAN", polys=None):
+    '''Triangulate every polygon (or only the given polygons) in one batched pass.
+
+    Returns an (n, 3) array of loop indices and the source polygon of each triangle.
+    '''
+    if polys is None:
+        polys = np.arange(arrays.total_polys, dtype=np.int32)
+    loop_total = arrays.loop_total[polys]
+    counts = np.maximum(loop_total - 2, 0)
+    tri_polys = np.repeat(polys, counts).astype(np.int32)
+    offsets = np.cumsum(counts) - counts
+    corner = np.arange(len(tri_polys), dtype=np.int32) - np.repeat(offsets, counts)
+
+    local = np.column_stack((np.zeros_like(corner), corner + 1, corner + 2))
+
+    if method == "SHORTEST_DIAGONAL":
+        quads = polys[loop_total == 4]
+        if len(quads) > 0:
+            quad_verts = arrays.loop_verts[arrays.loop_start[quads][:, None] + np.arange(4)]
+            co = arrays.vert_coords
+            diag_02 = np.sum((co[quad_verts[:, 0]] - co[quad_verts[:, 2]]) ** 2, axis=1)
+            diag_13 = np.sum((co[quad_verts[:, 1]] - co[quad_verts[:, 3]]) ** 2, axis=1)
+            rotate = np.zeros(arrays.total_polys, dtype=np.int32)
+            rotate[quads[diag_13 < diag_02]] = 1
+            local = (local + rotate[tri_polys][:, None]) % arrays.loop_total[tri_polys][:, None]
+
+    tris = arrays.loop_start[tri_polys][:, None] + local
+    return tris.astype(np.int32), tri_polys
+
+def find_bad_triangles(arrays, length_check_value, method="FAN", polys=None):
+    '''Returns (triangles, source polygons, cross values) for UV triangles that fail to form a triangle.
+
+    A triangle is flagged when abs(s1 * t2 - s2 * t1) is less than length_check_value, matching
+    the original per-face check. Quads and n-gons are triangulated with the given method first.
+    '''
+    tris, tri_polys = triangulate(arrays, method, polys)
+    cross = triangle_uv_cross(arrays.uvs, tris)
+    bad = np.abs(cross) < length_check_value
+    return tris[bad], tri_polys[bad], cross[bad]
+
+# Incremental checking
+
+class LLUVHelpers_CheckCache:
+    def __init__(self, topology_hash, settings, face_hashes, result):
+        self.topology_hash = topology_hash
+        self.settings = settings
+        self.face_hashes = face_hashes
+        self.result = result
+        self.last_rechecked = 0
+
+uv_check_cache = {}
+
+_HASH_MULTIPLIER = np.uint64(0xff51afd7ed558ccd)
+_HASH_SHIFT = np.uint64(33)
+
+def _mix_hash(keys):
+    keys ^= keys >> _HASH_SHIFT
+    keys *= _HASH_MULTIPLIER
+    keys ^= keys >> _HASH_SHIFT
+    return keys
+
+def topology_hash(arrays):
+    data = hashlib.md5(arrays.loop_verts.tobytes())
+    data.update(arrays.loop_total.tobytes())
+    return data.hexdigest()
+
+def face_hashes(arrays, use_coords=False):
+    '''A 64-bit hash of the UVs (and optionally vertex positions) of every polygon.'''
+    bits = arrays.uvs.view(np.uint32).astype(np.uint64)
+    keys = (bits[:, 0] << np.uint64(32)) | bits[:, 1]
+    keys ^= np.arange(arrays.total_loops, dtype=np.uint64) * _HASH_MULTIPLIER
+    keys = _mix_hash(keys)
+    if use_coords:
+        co_bits = arrays.vert_coords.view(np.uint32).astype(np.uint64)
+        co_keys = _mix_hash((co_bits[:, 0] << np.uint64(32)) | co_bits[:, 1])
+        co_keys = _mix_hash(co_keys ^ co_bits[:, 2])
+        keys ^= co_keys[arrays.loop_verts]
+    if arrays.total_polys == 0:
+        return np.zeros(0, dtype=np.uint64)
+    return np.add.reduceat(keys, arrays.loop_start)
+
+def find_bad_triangles_cached(arrays, length_check_value, method="FAN"):
+    '''find_bad_triangles, but only rechecking polygons whose UVs changed since the last run.
+
+    Results are cached per mesh and UV layer. A full check runs when the topology or the
+    check settings changed.
+    '''
+    key = (arrays.mesh_name, arrays.uv_layer_name)
+    settings = (length_check_value, method)
+    topo = topology_hash(arrays)
+    hashes = face_hashes(arrays, method == "SHORTEST_DIAGONAL")
+
+    cache = uv_check_cache.get(key)
+    if cache is None or cache.topology_hash != topo or cache.settings != settings:
+        result = find_bad_triangles(arrays, length_check_value, method)
+        cache = LLUVHelpers_CheckCache(topo, settings, hashes, result)
+        cache.last_rechecked = arrays.total_polys
+        uv_check_cache[key] = cache
+        return result
+
+    changed_mask = hashes != cache.face_hashes
+    changed = np.flatnonzero(changed_mask).astype(np.int32)
+    cache.last_rechecked = len(changed)
+    if len(changed) > 0:
+        tris, polys, cross = cache.result
+        keep = ~changed_mask[polys]
+        new_tris, new_polys, new_cross = find_bad_triangles(arrays, length_check_value, method, changed)
+        tris = np.concatenate((tris[keep], new_tris))
+        polys = np.concatenate((polys[keep], new_polys))
+        cross = np.concatenate((cross[keep], new_cross))
+        order = np.argsort(polys, kind="mergesort")
+        cache.result = (tris[order], polys[order], cross[order])
+        cache.face_hashes = hashes
+    return cache.result
+
+def get_last_rechecked(mesh_name, uv_layer_name):
+    cache = uv_check_cache.get((mesh_name, uv_layer_name))
+    return cache.last_rechecked if cache is not None else 0
+
+# Reports
+
+class LLUVHelpers_ErrorReport:
+    '''Array-backed results of a UV check on one mesh.
+
+    Each entry is a triangle: the polygon it came from, its check value and its three UVs.
+    '''
+    def __init__(self, label, object_name, arrays, tris, polys, values, value_format="{:.10f}"):
+        '''value_format is a format string or a function returning the display text of a value.'''
+        self.label = label
+        self.value_format = value_format
+        self.object_name = object_name
+        self.mesh_name = arrays.mesh_name
+        self.uv_layer_name = arrays.uv_layer_name
+        self.total_polys = arrays.total_polys
+        self.polys = polys
+        self.values = values
+        self.uvs = arrays.uvs[tris] if len(tris) > 0 else np.zeros((0, 3, 2), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.polys)
+
+    @property
+    def total_faces(self):
+        return len(np.unique(self.polys))
+
+    def format_value(self, index):
+        if callable(self.value_format):
+            return self.value_format(self.values[index])
+        return self.value_format.format(self.values[index])
+
+    def summary(self, limit=10):
+        lines = ["[LL-UV-Helper] {}: {} problems on {} faces in '{}' ({}).".format(
+            self.label, len(self), self.total_faces, self.object_name, self.uv_layer_name)]
+        for i in range(min(limit, len(self))):
+            uvs = ", ".join("({:.6f}, {:.6f})".format(u, v) for u, v in self.uvs[i])
+            lines.append("  Face {}: {} | {}".format(self.polys[i], self.format_value(i), uvs))
+        if len(self) > limit:
+            lines.append("  ...and {} more.".format(len(self) - limit))
+        return "\n".join(lines)
+
+uv_error_reports = {}
+
+def set_report(report):
+    uv_error_reports[report.mesh_name] = report
+
+def get_report(mesh_name):
+    return uv_error_reports.get(mesh_name)
+
+@persistent
+def clear_cache_on_load(scene):
+    uv_check_cache.clear()
+    uv_error_reports.clear()
+    uv_helpers_islands.uv_islands.clear()
+
+def map_objects(objects, func, args=(), prefetch=(), max_workers=None):
+    '''Run func(arrays, *args) for several mesh objects.
+
+    Arrays are extracted on the calling (main) thread, since bpy isn't thread-safe. The math then
+    runs in a thread pool; NumPy releases the GIL, so meshes are processed in parallel.
+    Lazy MeshArrays properties that func needs (e.g. "vert_coords") must be listed in prefetch.
+    Returns an OrderedDict of object name -> (arrays, result). Objects without a UV map are left out.
+    '''
+    extracted = []
+    for obj in objects:
+        arrays = get_mesh_arrays(obj)
+        if arrays.uvs is None:
+            continue
+        # Cache lazy data now, the worker threads can't touch bpy
+        for name in prefetch:
+            getattr(arrays, name)
+        extracted.append((obj.name, arrays))
+
+    results = OrderedDict()
+    if len(extracted) == 1:
+        name, arrays = extracted[0]
+        results[name] = (arrays, func(arrays, *args))
+    elif len(extracted) > 1:
+        workers = max_workers or min(len(extracted), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(name, arrays, executor.submit(func, arrays, *args)) for name, arrays in extracted]
+            for name, arrays, future in futures:
+                results[name] = (arrays, future.result())
+    return results
+
+def check_objects(objects, length_check_value, method="FAN", max_workers=None, incremental=False):
+    '''Run find_bad_triangles for several mesh objects (see map_objects).
+
+    Returns an OrderedDict of object name -> (arrays, triangles, polygons, cross values).
+    '''
+    check = find_bad_triangles_cached if incremental else find_bad_triangles
+    prefetch = ("vert_coords",) if method == "SHORTEST_DIAGONAL" else ()
+    results = map_objects(objects, check, (length_check_value, method), prefetch, max_workers)
+    return OrderedDict((name, (arrays,) + result) for name, (arrays, result) in results.items())
+
+def find_overlaps(arrays, method="FAN"):
+    '''Returns (triangles, polygons, overlapping polygon) for every UV triangle that overlaps another.'''
+    tris, tri_polys = triangulate(arrays, method)
+    a, b = uv_helpers_overlap.find_overlapping_triangles(arrays.uvs, tris)
+    hits = np.concatenate((a, b))
+    partners = np.concatenate((tri_polys[b], tri_polys[a]))
+    order = np.lexsort((partners, tri_polys[hits]))
+    hits = hits[order]
+    return tris[hits], tri_polys[hits], partners[order]
+
+def selected_uv_loops(arrays, sync=False):
+    '''Loop indices visible and selected in the UV view, in loop order.
+
+    With UV sync selection on, only the vertex selection matters.
+    '''
+    selected = arrays.vert_select[arrays.loop_verts]
+    if not sync:
+        selected &= arrays.uv_select
+    return np.flatnonzero(selected)
+
+def edge_dihedral_angles(arrays):
+    '''Angle in radians between the normals of the faces around every edge.
+
+    Edges used by more than two faces get the largest angle of any face pair, boundary and
+    loose edges get 0.
+    '''
+    loops = np.arange(arrays.total_loops, dtype=np.int64)
+    a, b, edges = uv_helpers_overlap.group_pairs(arrays.loop_edges.astype(np.int64), loops)
+    angles = np.zeros(arrays.total_edges, dtype=np.float64)
+    if len(a) == 0:
+        return angles
+    normals = arrays.poly_normals.astype(np.float64)
+    loop_polys = arrays.loop_polys
+    dot = np.sum(normals[loop_polys[a]] * normals[loop_polys[b]], axis=1)
+    np.maximum.at(angles, edges, np.arccos(np.clip(dot, -1.0, 1.0)))
+    return angles
+
+def polygon_loops(arrays, polys):
+    '''All loop indices belonging to the given polygons.'''
+    counts = arrays.loop_total[polys]
+    offsets = np.cumsum(counts) - counts
+    local = np.arange(counts.sum(), dtype=np.int32) - np.repeat(offsets, counts)
+    return np.repeat(arrays.loop_start[polys], counts) + local
+
+# Selection write-back
+
+def flush_vertex_selection(arrays, vert_select, edge_verts):
+    '''Edge and face selection implied by vert_select, like bm.select_flush(True).'''
+    edge_select = vert_select[edge_verts[:, 0]] & vert_select[edge_verts[:, 1]]
+    if arrays.total_polys > 0:
+        face_select = np.logical_and.reduceat(vert_select[arrays.loop_verts], arrays.loop_start)
+    else:
+        face_select = np.zeros(0, dtype=bool)
+    return edge_select, face_select
+
+@contextmanager
+def editable_mesh_data(obj):
+    '''Yields obj.data ready for foreach_set.
+
+    Edit-mode meshes are briefly toggled to object mode, since foreach_set only writes to obj.data.
+    '''
+    in_edit = obj.mode == "EDIT"
+    if in_edit:
+        bpy.ops.object.mode_set(mode="OBJECT")
+    try:
+        yield obj.data
+    finally:
+        if in_edit:
+            bpy.ops.object.mode_set(mode="EDIT")
+        else:
+            obj.data.update()
+
+def write_selection(obj, vert_select=None, edge_select=None, face_select=None, loop_select=None, uv_layer_name=None):
+    '''Write selection masks back to the mesh in bulk.'''
+    with editable_mesh_data(obj) as mesh:
+        if vert_select is not None:
+            mesh.vertices.foreach_set("select", vert_select)
+        if edge_select is not None:
+            mesh.edges.foreach_set("select", edge_select)
+        if face_select is not None:
+            mesh.polygons.foreach_set("select", face_select)
+        if loop_select is not None:
+            uv_layer = get_uv_layer(mesh, uv_layer_name)
+            if uv_layer is not None:
+                uv_layer.data.foreach_set("select", loop_select)
+
+def write_edge_flags(obj, attr, values):
+    '''Write an edge flag (e.g. "use_seam" or "use_edge_sharp") for every edge in bulk.'''
+    with editable_mesh_data(obj) as mesh:
+        mesh.edges.foreach_set(attr, values)
+
+def select_edges(obj, arrays, edges, vertex_mode=False):
+    '''Add the given edges (an index array or mask) to the current selection.
+
+    In vertex select mode only their vertices are added and the selection is flushed, otherwise
+    the edges themselves are selected and faces whose edges are all selected follow.
+    '''
+    edge_verts = arrays.edge_verts
+    vert_select = arrays.vert_select.copy()
+    vert_select[edge_verts[edges].ravel()] = True
+    if vertex_mode:
+        edge_select, face_select = flush_vertex_selection(arrays, vert_select, edge_verts)
+    else:
+        edge_select = arrays.edge_select.copy()
+        edge_select[edges] = True
+        face_select = arrays.poly_select.copy()
+        if arrays.total_polys > 0:
+            face_select |= np.logical_and.reduceat(edge_select[arrays.loop_edges], arrays.loop_start)
+    write_selection(obj, vert_select, edge_select, face_select)
+
+def select_loops(obj, arrays, loops, uv_layer_name=None):
+    '''Select only the vertices/UVs of the given loop indices, flushing to edges and faces.'''
+    vert_select = np.zeros(arrays.total_verts, dtype=bool)
+    vert_select[arrays.loop_verts[loops]] = True
+    loop_select = np.zeros(arrays.total_loops, dtype=bool)
+    loop_select[loops] = True
+    edge_select, face_select = flush_vertex_selection(arrays, vert_select, arrays.edge_verts)
+    write_selection(obj, vert_select, edge_select, face_select, loop_select, uv_layer_name)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from . import uv_helpers_arrays
+from . import uv_helpers_islands
+
+# Texel density.
+# Density is the number of texture pixels per unit of (world space) surface length:
+# resolution * sqrt(UV area / 3D area), per face and per UV island.
+
+def world_polygon_areas(arrays):
+    '''Area of every polygon after the object's transform (fan triangulated).'''
+    co = arrays.vert_coords.astype(np.float64)
+    if arrays.matrix_world is not None:
+        matrix = arrays.matrix_world
+        co = co.dot(matrix[:3, :3].T) + matrix[:3, 3]
+    tris, tri_polys = uv_helpers_arrays.triangulate(arrays, "FAN")
+    verts = arrays.loop_verts[tris]
+    cross = np.cross(co[verts[:, 1]] - co[verts[:, 0]], co[verts[:, 2]] - co[verts[:, 0]])
+    areas = np.sqrt(np.sum(cross * cross, axis=1)) * 0.5
+    return np.bincount(tri_polys, areas, arrays.total_polys)
+
+def densities(uv_areas, areas, resolution):
+    '''Pixels per unit for matching arrays of UV and 3D areas (0 where the 3D area is 0).'''
+    result = np.zeros(len(areas), dtype=np.float64)
+    valid = areas > 0
+    result[valid] = np.sqrt(uv_areas[valid] / areas[valid]) * resolution
+    return result
+
+class LLUVHelpers_TexelDensity:
+    '''Face and island texel densities of one mesh, for a square texture of the given resolution.'''
+    def __init__(self, arrays, resolution, use_seams=True):
+        self.object_name = arrays.object_name
+        self.mesh_name = arrays.mesh_name
+        self.resolution = resolution
+        self.target = 0.0
+
+        islands = uv_helpers_islands.LLUVHelpers_UVIslands(arrays, use_seams)
+        self.face_islands = islands.face_islands
+        self.face_areas = world_polygon_areas(arrays)
+        self.face_uv_areas = islands.face_uv_areas
+        self.face_density = densities(self.face_uv_areas, self.face_areas, resolution)
+
+        island_areas = np.bincount(islands.face_islands, self.face_areas, len(islands))
+        self.island_density = densities(islands.island_uv_areas, island_areas, resolution)
+
+        self.total_area = float(self.face_areas.sum())
+        self.total_uv_area = float(self.face_uv_areas.sum())
+        measured = self.face_density[self.face_areas > 0]
+        self.min_density = float(measured.min()) if len(measured) > 0 else 0.0
+        self.max_density = float(measured.max()) if len(measured) > 0 else 0.0
+
+    @property
+    def mean_density(self):
+        '''Area weighted mean, i.e. the density of the whole mesh.'''
+        if self.total_area <= 0:
+            return 0.0
+        return float(np.sqrt(self.total_uv_area / self.total_area) * self.resolution)
+
+    def face_values(self, use_islands=False):
+        '''The density of every face, or of the island each face belongs to.'''
+        if use_islands:
+            return self.island_density[self.face_islands]
+        return self.face_density
+
+    def outliers(self, target, tolerance, use_islands=False):
+        '''Polygons whose density is outside target +/- tolerance (a fraction of target).'''
+        values = self.face_values(use_islands)
+        low = target * (1.0 - tolerance)
+        high = target * (1.0 + tolerance)
+        return np.flatnonzero(((values < low) | (values > high)) & (self.face_areas > 0))
+
+def combined_density(results):
+    '''Area weighted mean density over several LLUVHelpers_TexelDensity results.'''
+    total_area = sum(density.total_area for density in results)
+    if total_area <= 0:
+        return 0.0
+    total_uv_area = sum(density.total_uv_area for density in results)
+    return float(np.sqrt(total_uv_area / total_area) * results[0].resolution)
+
+texel_densities = {}
+
+def set_density(density):
+    texel_densities[density.object_name] = density
+
+def get_density(object_name):
+    return texel_densities.get(object_name)
@@ -0,0 +1,123 @@
+import numpy as np
+
+from . import uv_helpers_overlap
+
+# UV island extraction.
+# Two faces belong to the same island when they share a non-seam edge whose UVs match on both
+# sides. Faces are merged with a vectorized union-find (min-label hooking plus pointer jumping),
+# which finishes in a handful of passes over the connected face pairs.
+
+def matching_loop_pairs(arrays, loops):
+    '''(a, b) pairs of the given loops that run along the same edge, their edge, and whether
+    the UVs on both sides of the edge match.'''
+    next_loops = arrays.next_loops
+    a, b, edges = uv_helpers_overlap.group_pairs(arrays.loop_edges[loops].astype(np.int64), loops)
+    if len(a) == 0:
+        return a, b, edges, np.zeros(0, dtype=bool)
+
+    uvs = arrays.uvs
+    a_next = next_loops[a]
+    b_next = next_loops[b]
+    same_direction = arrays.loop_verts[a] == arrays.loop_verts[b]
+    b_start = np.where(same_direction, b, b_next)
+    b_end = np.where(same_direction, b_next, b)
+    match = np.all(uvs[a] == uvs[b_start], axis=1) & np.all(uvs[a_next] == uvs[b_end], axis=1)
+    return a, b, edges, match
+
+def connected_face_pairs(arrays, use_seams=True):
+    '''(a, b) polygon pairs that are connected in UV space.'''
+    loops = np.arange(arrays.total_loops, dtype=np.int64)
+    if use_seams:
+        loops = loops[~arrays.edge_seams[arrays.loop_edges]]
+
+    a, b, edges, match = matching_loop_pairs(arrays, loops)
+    loop_polys = arrays.loop_polys
+    return loop_polys[a[match]], loop_polys[b[match]]
+
+def uv_split_edges(arrays):
+    '''Mask of the edges where the UVs of neighbouring faces don't match (UV island boundaries).'''
+    loops = np.arange(arrays.total_loops, dtype=np.int64)
+    a, b, edges, match = matching_loop_pairs(arrays, loops)
+    split = np.zeros(arrays.total_edges, dtype=bool)
+    split[edges[~match]] = True
+    return split
+
+def union_find(total, a, b):
+    '''Component label (the smallest member index) for each of total elements, given edges a-b.'''
+    labels = np.arange(total, dtype=np.int64)
+    if len(a) == 0:
+        return labels
+    while True:
+        la = labels[a]
+        lb = labels[b]
+        low = np.minimum(la, lb)
+        changed = np.any(la != lb)
+        if not changed:
+            break
+        # Hook the root of each side onto the smaller label
+        np.minimum.at(labels, la, low)
+        np.minimum.at(labels, lb, low)
+        # Pointer jumping until every element points straight at its root
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return labels
+
+def polygon_uv_areas(arrays):
+    '''Unsigned UV area of every polygon (shoelace formula).'''
+    if arrays.total_polys == 0:
+        return np.zeros(0, dtype=np.float64)
+    uvs = arrays.uvs.astype(np.float64)
+    nxt = uvs[arrays.next_loops]
+    cross = uvs[:, 0] * nxt[:, 1] - nxt[:, 0] * uvs[:, 1]
+    return np.abs(np.add.reduceat(cross, arrays.loop_start)) * 0.5
+
+class LLUVHelpers_UVIslands:
+    '''UV islands of one mesh and UV layer.
+
+    island_faces is every polygon index grouped by island, island_offsets[i] is where island i
+    starts in it. The other island_* arrays have one entry per island.
+    '''
+    def __init__(self, arrays, use_seams=True):
+        self.mesh_name = arrays.mesh_name
+        self.uv_layer_name = arrays.uv_layer_name
+        self.total_polys = arrays.total_polys
+
+        a, b = connected_face_pairs(arrays, use_seams)
+        labels = union_find(arrays.total_polys, a, b)
+        roots, self.face_islands = np.unique(labels, return_inverse=True)
+        self.total = len(roots)
+
+        self.island_faces = np.argsort(self.face_islands, kind="mergesort").astype(np.int32)
+        self.island_counts = np.bincount(self.face_islands, minlength=self.total)
+        self.island_offsets = np.cumsum(self.island_counts) - self.island_counts
+
+        self.face_uv_areas = polygon_uv_areas(arrays)
+        self.island_uv_areas = np.bincount(self.face_islands, self.face_uv_areas, self.total)
+        self.island_areas = np.bincount(self.face_islands, arrays.poly_areas.astype(np.float64), self.total)
+
+        loop_islands = self.face_islands[arrays.loop_polys]
+        self.island_uv_min = np.full((self.total, 2), np.inf)
+        self.island_uv_max = np.full((self.total, 2), -np.inf)
+        for axis in range(2):
+            np.minimum.at(self.island_uv_min[:, axis], loop_islands, arrays.uvs[:, axis])
+            np.maximum.at(self.island_uv_max[:, axis], loop_islands, arrays.uvs[:, axis])
+
+    def __len__(self):
+        return self.total
+
+    def faces(self, index):
+        start = self.island_offsets[index]
+        return self.island_faces[start:start + self.island_counts[index]]
+
+uv_islands = {}
+
+def build_islands(arrays, use_seams=True):
+    islands = LLUVHelpers_UVIslands(arrays, use_seams)
+    uv_islands[arrays.mesh_name] = islands
+    return islands
+
+def get_islands(mesh_name):
+    return uv_islands.get(mesh_name)
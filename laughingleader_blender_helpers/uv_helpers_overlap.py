@@ -0,0 +1,162 @@
+import numpy as np
+
+# UV overlap detection.
+# Triangle bounds are binned into a uniform grid (a spatial hash), and the exact
+# triangle-triangle tests only run on pairs that share a cell.
+# Triangles much larger than the cell size (an island-sized triangle among small ones) would
+# cover a huge number of cells, so they're kept out of the grid and tested against every bound.
+
+MAX_CELLS_PER_AXIS = 4096
+MAX_CELLS_PER_TRIANGLE = 64
+MAX_OVERSIZED = 256
+PAIR_CHUNK_SIZE = 1000000
+
+def _cell_size(mins, maxs):
+    extents = np.maximum(maxs[:, 0] - mins[:, 0], maxs[:, 1] - mins[:, 1])
+    size = float(np.median(extents)) if len(extents) > 0 else 0.0
+    span = float(max(np.max(maxs[:, 0]) - np.min(mins[:, 0]), np.max(maxs[:, 1]) - np.min(mins[:, 1])))
+    # Keep the grid bounded, tiny triangles would otherwise produce millions of empty cells
+    return max(size, span / MAX_CELLS_PER_AXIS, 1e-12)
+
+def group_pairs(keys, items):
+    '''All (a, b) pairs of items that share a key, with a < b, plus the shared key.'''
+    order = np.argsort(keys, kind="mergesort")
+    keys = keys[order]
+    items = items[order]
+
+    boundaries = np.flatnonzero(np.diff(keys)) + 1
+    group_start = np.concatenate(([0], boundaries))
+    group_size = np.diff(np.concatenate((group_start, [len(keys)])))
+
+    # For the element at rank r in a group of size g, pair it with the g-1-r elements after it
+    rank = np.arange(len(keys)) - np.repeat(group_start, group_size)
+    partners = np.repeat(group_size, group_size) - 1 - rank
+    first = np.repeat(np.arange(len(keys)), partners)
+    offsets = np.cumsum(partners) - partners
+    second = first + 1 + (np.arange(len(first)) - np.repeat(offsets, partners))
+
+    a = items[first]
+    b = items[second]
+    return np.minimum(a, b), np.maximum(a, b), keys[first]
+
+def candidate_pairs(points, eps=0.0):
+    '''Pairs of triangles with overlapping bounds, found through a uniform grid.
+
+    points is a (n, 3, 2) array. Bounds that only touch (within eps) are not candidates.
+    '''
+    total = len(points)
+    if total < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    mins = points.min(axis=1)
+    maxs = points.max(axis=1)
+    size = _cell_size(mins, maxs)
+    origin = mins.min(axis=0)
+    extent = float(np.max(maxs - origin))
+
+    # Use a coarser grid when too many triangles would be oversized for this one
+    while True:
+        cell_min = np.floor((mins - origin) / size).astype(np.int64)
+        cell_max = np.floor((maxs - origin) / size).astype(np.int64)
+        span = cell_max - cell_min + 1
+        counts = span[:, 0] * span[:, 1]
+        oversized = np.flatnonzero(counts > MAX_CELLS_PER_TRIANGLE)
+        if len(oversized) <= max(MAX_OVERSIZED, total // 100) or size >= extent:
+            break
+        size *= 4.0
+    rows = int(cell_max[:, 1].max()) + 1
+    counts[oversized] = 0
+
+    big_a, big_b = _oversized_pairs(mins, maxs, oversized, eps)
+
+    # Expand every other triangle into the cells its bounds cover
+    tri_ids = np.repeat(np.arange(total, dtype=np.int64), counts)
+    offsets = np.cumsum(counts) - counts
+    local = np.arange(len(tri_ids), dtype=np.int64) - np.repeat(offsets, counts)
+    width = span[tri_ids, 0]
+    cell_x = cell_min[tri_ids, 0] + local % width
+    cell_y = cell_min[tri_ids, 1] + local // width
+    del local, width
+
+    a, b, keys = group_pairs(cell_x * rows + cell_y, tri_ids)
+    if len(a) == 0:
+        return big_a, big_b
+
+    # Bounds must overlap by more than eps on both axes
+    low = np.maximum(mins[a], mins[b])
+    high = np.minimum(maxs[a], maxs[b])
+    keep = np.all(high - low > eps, axis=1)
+
+    # A pair can share several cells. Only keep it in the cell holding the low corner of the
+    # bounds intersection, which removes duplicates without a sort.
+    ref = np.floor((low - origin) / size).astype(np.int64)
+    keep &= (ref[:, 0] * rows + ref[:, 1]) == keys
+    return np.concatenate((a[keep], big_a)), np.concatenate((b[keep], big_b))
+
+def _oversized_pairs(mins, maxs, oversized, eps):
+    '''Pairs of each oversized triangle with every triangle whose bounds overlap it by more than eps.
+    Pairs of two oversized triangles are only listed once.'''
+    found_a = [np.zeros(0, dtype=np.int64)]
+    found_b = [np.zeros(0, dtype=np.int64)]
+    is_oversized = np.zeros(len(mins), dtype=bool)
+    is_oversized[oversized] = True
+    for index in oversized:
+        low = np.maximum(mins, mins[index])
+        high = np.minimum(maxs, maxs[index])
+        hit = np.all(high - low > eps, axis=1)
+        hit[index] = False
+        # The other oversized triangle lists the pair when it has the higher index
+        hit[:index] &= ~is_oversized[:index]
+        others = np.flatnonzero(hit)
+        found_a.append(np.minimum(others, index))
+        found_b.append(np.maximum(others, index))
+    return np.concatenate(found_a), np.concatenate(found_b)
+
+def triangles_overlap(ta, tb, eps=1e-12):
+    '''Exact overlap test for matching rows of two (n, 3, 2) triangle arrays.
+
+    Uses the separating axis test over the six edge normals. Triangles that only touch along an
+    edge or at a corner (within eps) don't count as overlapping.
+    '''
+    overlap = np.ones(len(ta), dtype=bool)
+    for tri in (ta, tb):
+        for i in range(3):
+            edge = tri[:, (i + 1) % 3] - tri[:, i]
+            axis_x = -edge[:, 1]
+            axis_y = edge[:, 0]
+            proj_a = ta[:, :, 0] * axis_x[:, None] + ta[:, :, 1] * axis_y[:, None]
+            proj_b = tb[:, :, 0] * axis_x[:, None] + tb[:, :, 1] * axis_y[:, None]
+            separated = (proj_a.max(axis=1) <= proj_b.min(axis=1) + eps) | (proj_b.max(axis=1) <= proj_a.min(axis=1) + eps)
+            overlap &= ~separated
+    return overlap
+
+def _area(points):
+    a = points[:, 0]
+    b = points[:, 1]
+    c = points[:, 2]
+    return (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+
+def find_overlapping_triangles(uvs, tris, min_area=1e-12):
+    '''Returns (a, b) index arrays into tris for every pair of overlapping UV triangles.
+
+    Degenerate triangles are skipped, those are reported by the triangle checker instead.
+    '''
+    points = uvs[tris].astype(np.float64)
+    area = np.abs(_area(points))
+    valid = np.flatnonzero(area > min_area)
+    points = points[valid]
+
+    eps = min_area * 1e-3
+    cand_a, cand_b = candidate_pairs(points, eps)
+    found_a = []
+    found_b = []
+    for start in range(0, len(cand_a), PAIR_CHUNK_SIZE):
+        a = cand_a[start:start + PAIR_CHUNK_SIZE]
+        b = cand_b[start:start + PAIR_CHUNK_SIZE]
+        hit = triangles_overlap(points[a], points[b], eps)
+        found_a.append(a[hit])
+        found_b.append(b[hit])
+
+    if len(found_a) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return valid[np.concatenate(found_a)], valid[np.concatenate(found_b)]
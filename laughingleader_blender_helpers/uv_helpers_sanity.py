@@ -0,0 +1,99 @@
+import numpy as np
+
+from . import uv_helpers_arrays
+
+# UV sanity checks.
+# One pass over the loop UVs classifies every face as having NaN/inf UVs, UVs far outside the
+# 0-1 range, or a flipped (clockwise) winding. Face flags are kept as one byte per face.
+
+NON_FINITE = 1
+OUT_OF_RANGE = 2
+FLIPPED = 4
+
+problem_names = (
+    (NON_FINITE, "NaN/Inf"),
+    (OUT_OF_RANGE, "Out of Range"),
+    (FLIPPED, "Flipped"),
+)
+
+problem_categories = (
+    ("NON_FINITE", "NaN/Inf", "Faces with NaN or infinite UVs"),
+    ("OUT_OF_RANGE", "Out of Range", "Faces with UVs further outside the 0-1 range than allowed"),
+    ("FLIPPED", "Flipped", "Faces with a mirrored (clockwise) UV winding"),
+)
+
+category_flags = {
+    "NON_FINITE": NON_FINITE,
+    "OUT_OF_RANGE": OUT_OF_RANGE,
+    "FLIPPED": FLIPPED,
+}
+
+def format_problems(flags):
+    flags = int(flags)
+    return ", ".join(name for flag, name in problem_names if flags & flag)
+
+def classify_uvs(arrays, uvs, max_distance=1.0):
+    '''Problem flags for every polygon, for one (n, 2) array of loop UVs.
+
+    max_distance is how far UVs may go outside the 0-1 range before they're out of range.
+    '''
+    flags = np.zeros(arrays.total_polys, dtype=np.uint8)
+    if arrays.total_polys == 0:
+        return flags
+
+    finite = np.all(np.isfinite(uvs), axis=1)
+    flags[~np.logical_and.reduceat(finite, arrays.loop_start)] |= NON_FINITE
+
+    with np.errstate(invalid="ignore"):
+        outside = np.any((uvs < -max_distance) | (uvs > 1.0 + max_distance), axis=1)
+    flags[np.logical_or.reduceat(outside, arrays.loop_start)] |= OUT_OF_RANGE
+
+    # Signed area (shoelace), negative for clockwise faces
+    points = np.where(finite[:, None], uvs, 0).astype(np.float64)
+    nxt = points[arrays.next_loops]
+    area = np.add.reduceat(points[:, 0] * nxt[:, 1] - nxt[:, 0] * points[:, 1], arrays.loop_start)
+    flags[(area < 0) & ((flags & NON_FINITE) == 0)] |= FLIPPED
+    return flags
+
+def classify_faces(arrays, max_distance=1.0, all_layers=False):
+    '''Problem flags for every polygon on the arrays' UV layer, or combined over every UV layer.'''
+    if not all_layers:
+        return classify_uvs(arrays, arrays.uvs, max_distance)
+    flags = np.zeros(arrays.total_polys, dtype=np.uint8)
+    for uvs in arrays.all_uvs.values():
+        flags |= classify_uvs(arrays, uvs, max_distance)
+    return flags
+
+def find_uv_problems(arrays, method="FAN", max_distance=1.0, all_layers=False):
+    '''Returns (triangles, polygons, flags) with one entry (the first triangle) per problem face.'''
+    flags = classify_faces(arrays, max_distance, all_layers)
+    set_face_flags(arrays.mesh_name, flags)
+    polys = np.flatnonzero(flags).astype(np.int32)
+    tris, tri_polys = uv_helpers_arrays.triangulate(arrays, method, polys)
+    # Triangles come out grouped by polygon, keep the first of each
+    first = np.concatenate(([True], tri_polys[1:] != tri_polys[:-1])) if len(tri_polys) > 0 else np.zeros(0, dtype=bool)
+    return tris[first], tri_polys[first], flags[tri_polys[first]]
+
+class LLUVHelpers_FaceProblems:
+    '''Problem flags of every face of one mesh, with the number of faces in each category.'''
+    def __init__(self, mesh_name, flags):
+        self.mesh_name = mesh_name
+        self.flags = flags
+        self.counts = dict((category, int(np.count_nonzero(flags & flag))) for category, flag in category_flags.items())
+
+    @property
+    def total(self):
+        return int(np.count_nonzero(self.flags))
+
+    def faces(self, category):
+        return np.flatnonzero(self.flags & category_flags[category]).astype(np.int32)
+
+face_problems = {}
+
+def set_face_flags(mesh_name, flags):
+    problems = LLUVHelpers_FaceProblems(mesh_name, flags)
+    face_problems[mesh_name] = problems
+    return problems
+
+def get_face_problems(mesh_name):
+    return face_problems.get(mesh_name)
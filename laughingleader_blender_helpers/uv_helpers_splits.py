@@ -0,0 +1,82 @@
+import numpy as np
+from collections import OrderedDict
+
+from . import uv_helpers_arrays
+from . import uv_helpers_tangents
+
+# Exported vertex count estimation.
+# GPU vertex buffers need one vertex per unique combination of position, UVs, split normal and
+# tangent sign, so Blender vertices are split wherever any of those differ between loops.
+
+class LLUVHelpers_VertexSplitEstimate:
+    '''Predicted exported vertex counts for one mesh.
+
+    total is the count with every UV layer, normals and tangent signs combined.
+    layer_totals has the count for each UV layer on its own (with normals and tangent signs).
+    vert_splits is how many exported vertices each Blender vertex turns into.
+    '''
+    def __init__(self, mesh_name, total_verts, total, layer_totals, vert_splits):
+        self.mesh_name = mesh_name
+        self.total_verts = total_verts
+        self.total = total
+        self.layer_totals = layer_totals
+        self.vert_splits = vert_splits
+
+    @property
+    def max_splits(self):
+        return int(self.vert_splits.max()) if len(self.vert_splits) > 0 else 0
+
+    def worst_verts(self, min_splits):
+        '''Vertices that are split into at least min_splits exported vertices.'''
+        return np.flatnonzero(self.vert_splits >= min_splits)
+
+def count_unique(arrays, columns):
+    '''Unique (vertex, columns...) combinations per loop, plus the number of splits per vertex.'''
+    keys = np.column_stack([arrays.loop_verts.astype(np.int64)] + columns)
+    groups, total = uv_helpers_arrays.unique_rows(keys)
+    # Each group belongs to exactly one vertex, so counting groups per vertex counts its splits
+    first = np.zeros(total, dtype=np.int64)
+    first[groups] = arrays.loop_verts
+    vert_splits = np.bincount(first, minlength=arrays.total_verts)
+    return total, vert_splits
+
+def estimate_vertex_count(arrays, method="FAN", use_normals=True, use_tangents=True):
+    '''Predict the exported vertex count of a mesh.
+
+    Needs the "all_uvs" and (when use_normals is set) "loop_normals" MeshArrays data, and
+    "vert_coords" for the tangent signs.
+    '''
+    base = []
+    if use_normals:
+        base.extend(uv_helpers_arrays.float_bits(arrays.loop_normals).astype(np.int64).T)
+    if use_tangents and arrays.uvs is not None:
+        tris, tri_polys = uv_helpers_arrays.triangulate(arrays, method)
+        handedness = uv_helpers_tangents.triangle_frames(arrays, tris)[3]
+        base.append(uv_helpers_tangents.loop_handedness(arrays, tris, handedness).astype(np.int64))
+
+    layer_columns = OrderedDict()
+    for name, uvs in arrays.all_uvs.items():
+        layer_columns[name] = list(uv_helpers_arrays.float_bits(uvs).astype(np.int64).T)
+
+    layer_totals = OrderedDict()
+    for name, columns in layer_columns.items():
+        layer_totals[name] = count_unique(arrays, base + columns)[0]
+
+    combined = list(base)
+    for columns in layer_columns.values():
+        combined.extend(columns)
+    if len(combined) == 0:
+        total = len(np.unique(arrays.loop_verts))
+        vert_splits = np.minimum(np.bincount(arrays.loop_verts, minlength=arrays.total_verts), 1)
+    else:
+        total, vert_splits = count_unique(arrays, combined)
+
+    return LLUVHelpers_VertexSplitEstimate(arrays.mesh_name, arrays.total_verts, total, layer_totals, vert_splits)
+
+vertex_estimates = {}
+
+def set_estimate(estimate):
+    vertex_estimates[estimate.mesh_name] = estimate
+
+def get_estimate(mesh_name):
+    return vertex_estimates.get(mesh_name)
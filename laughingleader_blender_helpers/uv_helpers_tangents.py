@@ -0,0 +1,122 @@
+import numpy as np
+
+from . import uv_helpers_arrays
+from . import uv_helpers_islands
+
+# Tangent frame validation.
+# Tangents/bitangents are built per triangle from positions and UVs, the same way exporters
+# generate them, then accumulated per split vertex (a vertex + UV pair).
+
+DEGENERATE = 1
+NON_ORTHOGONAL = 2
+MIRRORED = 4
+VERTEX_FRAME = 8
+
+problem_names = (
+    (DEGENERATE, "Degenerate"),
+    (NON_ORTHOGONAL, "Non-Orthogonal"),
+    (MIRRORED, "Mirrored"),
+    (VERTEX_FRAME, "Vertex Frame"),
+)
+
+def format_problems(flags):
+    flags = int(flags)
+    return ", ".join(name for flag, name in problem_names if flags & flag)
+
+def _normalize(vectors):
+    length = np.sqrt(np.sum(vectors * vectors, axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return vectors / length[:, None], length
+
+def loop_handedness(arrays, tris, handedness):
+    '''Tangent sign of every loop, taken from a triangle that uses it (0 for unused loops).'''
+    signs = np.zeros(arrays.total_loops, dtype=np.int8)
+    signs[tris.ravel()] = np.repeat(handedness, 3)
+    return signs
+
+def triangle_frames(arrays, tris):
+    '''Per-triangle (tangent, bitangent, normal, handedness) arrays, unnormalized.'''
+    co = arrays.vert_coords.astype(np.float64)
+    uvs = arrays.uvs.astype(np.float64)
+    verts = arrays.loop_verts[tris]
+
+    e1 = co[verts[:, 1]] - co[verts[:, 0]]
+    e2 = co[verts[:, 2]] - co[verts[:, 0]]
+    d1 = uvs[tris[:, 1]] - uvs[tris[:, 0]]
+    d2 = uvs[tris[:, 2]] - uvs[tris[:, 0]]
+
+    r = d1[:, 0] * d2[:, 1] - d2[:, 0] * d1[:, 1]
+    normals = np.cross(e1, e2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / r
+        tangents = (e1 * d2[:, 1, None] - e2 * d1[:, 1, None]) * inv[:, None]
+        bitangents = (e2 * d1[:, 0, None] - e1 * d2[:, 0, None]) * inv[:, None]
+        handedness = np.sign(np.sum(np.cross(normals, tangents) * bitangents, axis=1))
+    handedness[~np.isfinite(handedness)] = 0
+    return tangents, bitangents, normals, handedness
+
+def find_bad_tangent_frames(arrays, method="FAN", min_angle=5.0, use_seams=True):
+    '''Returns (triangles, polygons, problem flags) for every triangle with a broken tangent frame.
+
+    DEGENERATE: the tangent or bitangent is zero, infinite or NaN.
+    NON_ORTHOGONAL: the tangent and bitangent are less than min_angle degrees from parallel.
+    MIRRORED: the handedness differs from the majority of the triangle's UV island.
+    VERTEX_FRAME: a split vertex of the triangle mixes handedness, or its accumulated tangent
+    collapses onto the normal.
+    '''
+    tris, tri_polys = uv_helpers_arrays.triangulate(arrays, method)
+    flags = np.zeros(len(tris), dtype=np.int32)
+    if len(tris) == 0:
+        return tris, tri_polys, flags
+
+    tangents, bitangents, normals, handedness = triangle_frames(arrays, tris)
+    t_unit, t_length = _normalize(tangents)
+    b_unit, b_length = _normalize(bitangents)
+
+    finite = np.isfinite(t_length) & np.isfinite(b_length) & (t_length > 1e-12) & (b_length > 1e-12)
+    flags[~finite] |= DEGENERATE
+
+    cos_limit = np.cos(np.radians(min_angle))
+    with np.errstate(invalid="ignore"):
+        parallel = np.abs(np.sum(t_unit * b_unit, axis=1)) > cos_limit
+    flags[finite & parallel] |= NON_ORTHOGONAL
+
+    # Handedness should be consistent within an island
+    islands = uv_helpers_islands.LLUVHelpers_UVIslands(arrays, use_seams)
+    tri_islands = islands.face_islands[tri_polys]
+    valid = finite & (handedness != 0)
+    votes = np.bincount(tri_islands[valid], handedness[valid], len(islands))
+    majority = np.sign(votes)[tri_islands]
+    flags[valid & (majority != 0) & (handedness != majority)] |= MIRRORED
+
+    # Per split vertex frames
+    bits = uv_helpers_arrays.float_bits(arrays.uvs).astype(np.int64)
+    keys = np.column_stack((arrays.loop_verts, bits[:, 0], bits[:, 1]))
+    loop_groups, total_groups = uv_helpers_arrays.unique_rows(keys)
+
+    corner_groups = loop_groups[tris[valid]].ravel()
+    weight = np.repeat(np.sqrt(np.sum(normals[valid] * normals[valid], axis=1)), 3)
+    group_tangent = np.zeros((total_groups, 3))
+    group_normal = np.zeros((total_groups, 3))
+    group_weight = np.zeros(total_groups)
+    for axis in range(3):
+        np.add.at(group_tangent[:, axis], corner_groups, np.repeat(t_unit[valid][:, axis], 3) * weight)
+        np.add.at(group_normal[:, axis], corner_groups, np.repeat(normals[valid][:, axis], 3))
+    np.add.at(group_weight, corner_groups, weight)
+
+    group_min = np.ones(total_groups)
+    group_max = -np.ones(total_groups)
+    np.minimum.at(group_min, corner_groups, np.repeat(handedness[valid], 3))
+    np.maximum.at(group_max, corner_groups, np.repeat(handedness[valid], 3))
+    mixed = group_min < group_max
+
+    n_unit, _ = _normalize(group_normal)
+    ortho = group_tangent - n_unit * np.sum(group_tangent * n_unit, axis=1)[:, None]
+    with np.errstate(invalid="ignore"):
+        collapsed = np.sqrt(np.sum(ortho * ortho, axis=1)) < group_weight * 1e-4
+    bad_groups = (mixed | collapsed) & (group_weight > 0)
+
+    flags[np.any(bad_groups[loop_groups[tris]], axis=1)] |= VERTEX_FRAME
+
+    bad = flags != 0
+    return tris[bad], tri_polys[bad], flags[bad]
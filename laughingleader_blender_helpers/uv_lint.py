@@ -0,0 +1,209 @@
+"""
+Headless UV lint runner.
+
+Checks every mesh and UV layer in a directory of .blend files for UV triangles that fail to form
+a mathematical triangle (the same check as "Check UV Triangles"), spreading the files over a pool
+of background Blender processes.
+
+Usage:
+    blender -b --factory-startup --python uv_lint.py -- <directory> [options]
+
+Options:
+    --workers N          Number of Blender processes to run at once (default: CPU count)
+    --report PATH        Write the JSON report to PATH (default: print to stdout)
+    --precision N        Same as the "Precision" preference, the final value is N/100000000 (default: 10)
+    --triangulation M    FAN or SHORTEST_DIAGONAL (default: FAN)
+    --recursive          Search sub-directories too
+    --blender PATH       Blender executable for the workers (default: this Blender)
+
+Exit codes: 0 = no problems, 1 = UV problems found, 2 = one or more files failed to check.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+EXIT_OK = 0
+EXIT_UV_ERRORS = 1
+EXIT_FAILED = 2
+
+MAX_REPORTED_FACES = 100
+
+def get_args():
+    argv = sys.argv
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+
+    parser = argparse.ArgumentParser(prog="uv_lint.py", description="Check .blend files for bad UV triangles.")
+    parser.add_argument("directory", nargs="?", default="")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report", default="")
+    parser.add_argument("--precision", type=int, default=10)
+    parser.add_argument("--triangulation", default="FAN", choices=("FAN", "SHORTEST_DIAGONAL"))
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--blender", default="")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default="", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+# Worker (runs inside Blender with the .blend file loaded)
+
+def import_uv_helpers_arrays():
+    addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if addon_dir not in sys.path:
+        sys.path.insert(0, addon_dir)
+    from laughingleader_blender_helpers import uv_helpers_arrays
+    return uv_helpers_arrays
+
+def check_loaded_file(args):
+    import bpy
+    import numpy as np
+    uv_helpers_arrays = import_uv_helpers_arrays()
+
+    length_check_value = float(args.precision/100000000)
+    meshes = []
+    for mesh in bpy.data.meshes:
+        if mesh.users == 0:
+            continue
+        entry = {
+            "mesh": mesh.name,
+            "objects": [obj.name for obj in bpy.data.objects if obj.data == mesh],
+            "polygons": len(mesh.polygons),
+            "uv_layers": []
+        }
+        for uv_layer in mesh.uv_layers:
+            start = time.perf_counter()
+            arrays = uv_helpers_arrays.LLUVHelpers_MeshArrays(mesh, uv_layer)
+            tris, polys, cross = uv_helpers_arrays.find_bad_triangles(arrays, length_check_value, args.triangulation)
+            bad_polys = np.unique(polys)
+            entry["uv_layers"].append({
+                "name": uv_layer.name,
+                "errors": int(len(tris)),
+                "faces": int(len(bad_polys)),
+                "face_indices": bad_polys[:MAX_REPORTED_FACES].tolist(),
+                "time": time.perf_counter() - start
+            })
+        meshes.append(entry)
+    return meshes
+
+def run_worker(args):
+    import bpy
+    start = time.perf_counter()
+    result = {"file": bpy.data.filepath, "meshes": [], "error": ""}
+    try:
+        result["meshes"] = check_loaded_file(args)
+    except Exception as e:
+        result["error"] = str(e)
+    result["check_time"] = time.perf_counter() - start
+    with open(args.output, "w") as f:
+        json.dump(result, f)
+
+# Driver
+
+def find_blend_files(directory, recursive=False):
+    files = []
+    if recursive:
+        for root, dirs, names in os.walk(directory):
+            files.extend(os.path.join(root, name) for name in names if name.lower().endswith(".blend"))
+    else:
+        files = [os.path.join(directory, name) for name in os.listdir(directory) if name.lower().endswith(".blend")]
+    return sorted(files)
+
+def get_blender_path(args):
+    if args.blender != "":
+        return args.blender
+    try:
+        import bpy
+        return bpy.app.binary_path
+    except ImportError:
+        return "blender"
+
+def lint_file(blender, filepath, args):
+    fd, output = tempfile.mkstemp(suffix=".json", prefix="uv_lint_")
+    os.close(fd)
+    command = [blender, "-b", "--factory-startup", filepath, "--python", os.path.abspath(__file__), "--",
+        "--worker", "--output", output,
+        "--precision", str(args.precision),
+        "--triangulation", args.triangulation]
+
+    start = time.perf_counter()
+    result = {"file": filepath, "meshes": [], "error": ""}
+    try:
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if os.path.getsize(output) > 0:
+            with open(output, "r") as f:
+                result = json.load(f)
+            result["file"] = filepath
+        else:
+            result["error"] = "Blender exited with code {} without writing a result".format(process.returncode)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+    result["time"] = time.perf_counter() - start
+
+    errors = sum(layer["errors"] for mesh in result["meshes"] for layer in mesh["uv_layers"])
+    result["errors"] = errors
+    status = "FAILED ({})".format(result["error"]) if result["error"] != "" else "{} problems".format(errors)
+    print("[LL-UV-Lint] {} - {} ({:.2f}s)".format(filepath, status, result["time"]))
+    return result
+
+def run_driver(args):
+    if args.directory == "" or not os.path.isdir(args.directory):
+        print("[LL-UV-Lint] Directory not found: '{}'".format(args.directory))
+        return EXIT_FAILED
+
+    files = find_blend_files(args.directory, args.recursive)
+    blender = get_blender_path(args)
+    workers = max(1, args.workers)
+    print("[LL-UV-Lint] Checking {} files with {} workers.".format(len(files), workers))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda filepath: lint_file(blender, filepath, args), files))
+
+    failed = [r["file"] for r in results if r["error"] != ""]
+    total_errors = sum(r["errors"] for r in results)
+    report = {
+        "directory": os.path.abspath(args.directory),
+        "precision": args.precision,
+        "triangulation": args.triangulation,
+        "workers": workers,
+        "total_time": time.perf_counter() - start,
+        "total_files": len(files),
+        "total_errors": total_errors,
+        "files_with_errors": sum(1 for r in results if r["errors"] > 0),
+        "failed": failed,
+        "files": results
+    }
+
+    if args.report != "":
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print("[LL-UV-Lint] Wrote report to '{}'".format(args.report))
+    else:
+        print(json.dumps(report, indent=2))
+
+    print("[LL-UV-Lint] {} problems in {}/{} files, {} failed ({:.2f}s).".format(
+        total_errors, report["files_with_errors"], len(files), len(failed), report["total_time"]))
+
+    if len(failed) > 0:
+        return EXIT_FAILED
+    if total_errors > 0:
+        return EXIT_UV_ERRORS
+    return EXIT_OK
+
+def main():
+    args = get_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        sys.exit(run_driver(args))
+
+if __name__ == "__main__":
+    main()